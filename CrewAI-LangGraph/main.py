@@ -1,4 +1,19 @@
+import asyncio
+import os
+
 from src.graph import WorkFlow
+from src.mailbox_scheduler import MailboxScheduler
 
 app = WorkFlow().app
-app.invoke({})
\ No newline at end of file
+
+async def check_mailbox():
+	state = await asyncio.to_thread(app.invoke, {})
+	return len(state.get('emails', []))
+
+scheduler = MailboxScheduler(
+	interval=float(os.environ.get('POLL_INTERVAL', 180)),
+	max_interval=float(os.environ.get('POLL_MAX_INTERVAL', 1800))
+)
+scheduler.add(os.environ['MY_EMAIL'], check_mailbox)
+wake_port = os.environ.get('WAKE_PORT')
+asyncio.run(scheduler.run(trigger_port=int(wake_port) if wake_port else None))
@@ -1,10 +1,9 @@
 from langchain_community.agent_toolkits import GmailToolkit
-from langchain_community.tools.gmail.get_thread import GmailGetThread
 from langchain_community.tools.tavily_search import TavilySearchResults
 
 from textwrap import dedent
 from crewai import Agent
-from .tools import CreateDraftTool
+from .tools import CachedGmailGetThread, CreateDraftTool
 
 class EmailFilterAgents():
 	def __init__(self):
@@ -33,7 +32,7 @@ class EmailFilterAgents():
 				in identifying emails that require immediate action. Your skill set includes interpreting
 				the urgency and importance of an email based on its content and context."""),
 			tools=[
-				GmailGetThread(api_resource=self.gmail.api_resource),
+				CachedGmailGetThread(api_resource=self.gmail.api_resource),
 				TavilySearchResults()
 			],
 			verbose=True,
@@ -50,7 +49,7 @@ class EmailFilterAgents():
 				tailored to address the specific needs and context of the email."""),
 			tools=[
 				TavilySearchResults(),
-				GmailGetThread(api_resource=self.gmail.api_resource),
+				CachedGmailGetThread(api_resource=self.gmail.api_resource),
 				CreateDraftTool.create_draft
 			],
 			verbose=True,
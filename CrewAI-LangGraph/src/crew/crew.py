@@ -2,6 +2,7 @@ from crewai import Crew
 
 from .agents import EmailFilterAgents
 from .tasks import EmailFilterTasks
+from ..draft_writer import email_address, get_draft_writer
 
 class EmailFilterCrew():
 	def __init__(self):
@@ -23,7 +24,14 @@ class EmailFilterCrew():
 			verbose=True
 		)
 		result = crew.kickoff()
-		return {**state, "action_required_emails": result}
+		drafted = get_draft_writer().flush_by_recipient()
+		# Drafts are matched to emails by their sender; an email without a draft needs none
+		answered_emails = [
+			email['id']
+			for email in state['emails']
+			if drafted.get(email_address(email['sender']), True)
+		]
+		return {**state, "action_required_emails": result, "answered_emails": answered_emails}
 
 	def _format_emails(self, emails):
 		emails_string = []
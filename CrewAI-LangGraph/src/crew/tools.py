@@ -1,26 +1,38 @@
-from langchain_community.agent_toolkits import GmailToolkit
-from langchain_community.tools.gmail.create_draft import GmailCreateDraft
+import os
+from typing import Dict, Optional
+
 from langchain.tools import tool
+from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_community.tools.gmail.get_thread import GmailGetThread
+
+from ..draft_writer import get_draft_writer
+from ..thread_cache import get_thread_cache
 
 class CreateDraftTool():
   @tool("Create Draft")
-  def create_draft(data):
+  def create_draft(to: str, subject: str, message: str):
     """
     	Useful to create an email draft.
-      The input to this tool should be a pipe (|) separated text
-      of length 3 (three), representing who to send the email to,
-      the subject of the email and the actual message.
-      For example, `lorem@ipsum.com|Nice To Meet You|Hey it was great to meet you.`.
+      The input to this tool is who to send the email to (`to`),
+      the subject of the email (`subject`) and the actual message (`message`).
+      For example, `to="lorem@ipsum.com"`, `subject="Nice To Meet You"`,
+      `message="Hey it was great to meet you."`.
     """
-    email, subject, message = data.split('|')
-    gmail = GmailToolkit()
-    draft = GmailCreateDraft(api_resource=gmail.api_resource)
-    result = draft({
-				'to': [email],
-				'subject': subject,
-				'message': message
-		})
-    return f"\nDraft created: {result}\n"
-
+    # Drafts are created in one batch once the crew is done
+    writer = get_draft_writer()
+    writer.add(to=to, subject=subject, message=message)
+    return f"\nDraft to {to} queued ({writer.pending} waiting to be created)\n"
 
+class CachedGmailGetThread(GmailGetThread):
+  """
+    GmailGetThread that serves threads from the process-wide thread cache when they are unchanged.
+  """
 
+  def _run(self, thread_id: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> Dict:
+    cache = get_thread_cache()
+    mailbox = os.environ['MY_EMAIL']
+    thread = cache.get(mailbox, thread_id)
+    if thread is None:
+      thread = super()._run(thread_id, run_manager=run_manager)
+      cache.put(mailbox, thread_id, thread)
+    return thread
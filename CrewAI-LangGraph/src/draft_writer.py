@@ -0,0 +1,133 @@
+import base64
+import threading
+from concurrent.futures import Future
+from email.mime.text import MIMEText
+from email.utils import getaddresses, parseaddr
+from typing import Dict, List, Optional, Tuple
+
+from langchain_community.agent_toolkits import GmailToolkit
+
+# Gmail accepts up to 100 calls per batch but recommends staying at 50 or fewer
+MAX_BATCH_SIZE = 50
+
+
+def email_address(header: str) -> str:
+	"""
+	The bare, lowercased address of a `From` or `To` value such as `Jane <Jane@example.com>`.
+	"""
+	return parseaddr(header)[1].lower()
+
+
+class DraftWriter:
+	"""
+	Queues email drafts and creates them with batched Gmail API calls.
+
+	One authenticated API resource is kept for the writer's lifetime. Drafts are only built and
+	queued by `add()`; `flush()` sends the whole queue as a single batch HTTP request (or one per
+	`batch_size` drafts), so a run that writes ten replies costs one round trip instead of ten
+	toolkit setups and ten requests. Every queued draft gets a future that `flush()` resolves to
+	the ID of the created draft, or fails with the error Gmail returned for that draft.
+	`flush_by_recipient()` tells which recipients got all of their drafts, for callers that need
+	to know which emails were answered but did not queue the drafts themselves.
+	"""
+
+	def __init__(self, api_resource, batch_size: int = MAX_BATCH_SIZE):
+		self.api_resource = api_resource
+		self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+		self._queue: List[Tuple[str, dict, Future]] = []
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _draft_body(to: str, subject: str, message: str) -> dict:
+		mime_message = MIMEText(message)
+		mime_message["To"] = to
+		mime_message["Subject"] = subject
+		raw = base64.urlsafe_b64encode(mime_message.as_bytes()).decode()
+		return {"message": {"raw": raw}}
+
+	def add(self, to: str, subject: str, message: str) -> Future:
+		"""
+		Queue a draft; the returned future resolves to the draft ID once `flush()` creates it.
+		"""
+		future: Future = Future()
+		with self._lock:
+			self._queue.append((to, self._draft_body(to, subject, message), future))
+		return future
+
+	@property
+	def pending(self) -> int:
+		return len(self._queue)
+
+	def flush(self) -> List[str]:
+		"""
+		Create every queued draft and return the IDs of the drafts Gmail created.
+
+		A draft Gmail rejects fails its own future without stopping the others.
+		"""
+		return [future.result() for _, _, future in self._send() if future.exception() is None]
+
+	def flush_by_recipient(self) -> Dict[str, bool]:
+		"""
+		Create every queued draft and tell per recipient address whether all its drafts were created.
+		"""
+		created: Dict[str, bool] = {}
+		for to, _, future in self._send():
+			for _, address in getaddresses([to]):
+				address = address.lower()
+				created[address] = created.get(address, True) and future.exception() is None
+		return created
+
+	def _send(self) -> List[Tuple[str, dict, Future]]:
+		with self._lock:
+			queue, self._queue = self._queue, []
+
+		created = 0
+		for start in range(0, len(queue), self.batch_size):
+			batch = queue[start : start + self.batch_size]
+			try:
+				self._create_batch(batch)
+				error: Exception = RuntimeError("Gmail did not answer for this draft")
+			except Exception as e:
+				# The whole request failed, none of its unanswered drafts were created
+				print(f"## Could not create {len(batch)} drafts: {e}")
+				error = e
+			for _, _, future in batch:
+				if not future.done():
+					future.set_exception(error)
+			created += sum(1 for _, _, future in batch if future.exception() is None)
+		if queue:
+			print(f"## Created {created} of {len(queue)} drafts")
+		return queue
+
+	def _create_batch(self, batch: List[Tuple[str, dict, Future]]):
+		drafts = self.api_resource.users().drafts()
+		if len(batch) == 1:
+			_, body, future = batch[0]
+			future.set_result(drafts.create(userId="me", body=body).execute()["id"])
+			return
+
+		def collect(request_id: str, response: Optional[dict], exception: Optional[Exception]):
+			future = batch[int(request_id)][2]
+			if exception is not None:
+				print(f"## Could not create draft {request_id}: {exception}")
+				future.set_exception(exception)
+			else:
+				future.set_result(response["id"])
+
+		request = self.api_resource.new_batch_http_request(callback=collect)
+		for position, (_, body, _) in enumerate(batch):
+			request.add(drafts.create(userId="me", body=body), request_id=str(position))
+		request.execute()
+
+
+_draft_writer: Optional[DraftWriter] = None
+
+
+def get_draft_writer() -> DraftWriter:
+	"""
+	Return the process-wide draft writer, authenticating on first use.
+	"""
+	global _draft_writer
+	if _draft_writer is None:
+		_draft_writer = DraftWriter(GmailToolkit().api_resource)
+	return _draft_writer
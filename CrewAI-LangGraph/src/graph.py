@@ -1,7 +1,7 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from langgraph.graph import StateGraph
+from langgraph.graph import END, StateGraph
 
 from .state import EmailsState
 from .nodes import Nodes
@@ -13,8 +13,8 @@ class WorkFlow():
 		workflow = StateGraph(EmailsState)
 
 		workflow.add_node("check_new_emails", nodes.check_email)
-		workflow.add_node("wait_next_run", nodes.wait_next_run)
 		workflow.add_node("draft_responses", EmailFilterCrew().kickoff)
+		workflow.add_node("mark_seen", nodes.mark_seen)
 
 		workflow.set_entry_point("check_new_emails")
 		workflow.add_conditional_edges(
@@ -22,9 +22,10 @@ class WorkFlow():
 				nodes.new_emails,
 				{
 					"continue": 'draft_responses',
-					"end": 'wait_next_run'
+					"end": END
 				}
 		)
-		workflow.add_edge('draft_responses', 'wait_next_run')
-		workflow.add_edge('wait_next_run', 'check_new_emails')
+		# A run handles one batch of mail, src/mailbox_scheduler.py decides when the next one starts
+		workflow.add_edge('draft_responses', 'mark_seen')
+		workflow.add_edge('mark_seen', END)
 		self.app = workflow.compile()
\ No newline at end of file
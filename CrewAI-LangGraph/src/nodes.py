@@ -1,23 +1,30 @@
 import os
-import time
 
 from langchain_community.agent_toolkits import GmailToolkit
 from langchain_community.tools.gmail.search import GmailSearch
 
+from .seen_store import SeenStore
+from .thread_cache import get_thread_cache
+
 class Nodes():
 	def __init__(self):
 		self.gmail = GmailToolkit()
+		# Handled email IDs are kept on disk, so restarts do not draft the same replies again
+		self.seen_emails = SeenStore()
 
 	def check_email(self, state):
 		print("# Checking for new emails")
 		search = GmailSearch(api_resource=self.gmail.api_resource)
 		emails = search('after:newer_than:1d')
-		checked_emails = state['checked_emails_ids'] if state['checked_emails_ids'] else []
-		thread = []
+		# Search results are newest first, so each thread ends up keyed by its newest message
+		thread_cache = get_thread_cache()
+		for email in reversed(emails):
+			thread_cache.note_message(os.environ['MY_EMAIL'], email['threadId'], email['id'])
+		thread = set()
 		new_emails = []
 		for email in emails:
-			if (email['id'] not in checked_emails) and (email['threadId'] not in thread) and ( os.environ['MY_EMAIL'] not in email['sender']):
-				thread.append(email['threadId'])
+			if (email['id'] not in self.seen_emails) and (email['threadId'] not in thread) and ( os.environ['MY_EMAIL'] not in email['sender']):
+				thread.add(email['threadId'])
 				new_emails.append(
 					{
 						"id": email['id'],
@@ -26,16 +33,21 @@ class Nodes():
 						"sender": email["sender"]
 					}
 				)
-		checked_emails.extend([email['id'] for email in emails])
+		# Mail that needs no reply is done with; the rest is marked once its drafts are created
+		handled = {email['id'] for email in new_emails}
+		self.seen_emails.add(email['id'] for email in emails if email['id'] not in handled)
+		self.seen_emails.expire()
 		return {
 			**state,
-			"emails": new_emails,
-			"checked_emails_ids": checked_emails
+			"emails": new_emails
 		}
 
-	def wait_next_run(self, state):
-		print("## Waiting for 180 seconds")
-		time.sleep(180)
+	def mark_seen(self, state):
+		answered = state.get('answered_emails', [])
+		self.seen_emails.add(answered)
+		unanswered = len(state['emails']) - len(answered)
+		if unanswered:
+			print(f"## Drafts for {unanswered} emails were not created, these are not marked as seen")
 		return state
 
 	def new_emails(self, state):
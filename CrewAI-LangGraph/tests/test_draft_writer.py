@@ -0,0 +1,139 @@
+import math
+
+import pytest
+
+pytest.importorskip("langchain_community")
+
+from src.draft_writer import MAX_BATCH_SIZE, DraftWriter  # noqa: E402
+
+
+class FakeCreate:
+	def __init__(self, gmail, body):
+		self.gmail = gmail
+		self.body = body
+
+	def execute(self):
+		self.gmail.round_trips += 1
+		return self.gmail.answer(self.body)
+
+
+class FakeBatch:
+	def __init__(self, gmail, callback):
+		self.gmail = gmail
+		self.callback = callback
+		self.requests = []
+
+	def add(self, request, request_id):
+		self.requests.append((request_id, request))
+
+	def execute(self):
+		self.gmail.round_trips += 1
+		self.gmail.batch_sizes.append(len(self.requests))
+		if len(self.gmail.batch_sizes) in self.gmail.failed_batches:
+			raise ConnectionError("connection reset")
+		for request_id, request in self.requests:
+			try:
+				response, exception = self.gmail.answer(request.body), None
+			except Exception as e:
+				response, exception = None, e
+			self.callback(request_id, response, exception)
+
+
+class FakeGmail:
+	"""
+	Just enough of the Gmail API resource for the draft writer, counting the HTTP round trips.
+	"""
+
+	def __init__(self, rejected=(), failed_batches=()):
+		self.rejected = set(rejected)
+		# 1-based numbers of the batch requests that fail as a whole
+		self.failed_batches = set(failed_batches)
+		self.round_trips = 0
+		self.batch_sizes = []
+
+	def answer(self, body):
+		subject = body["subject"]
+		if subject in self.rejected:
+			raise ValueError(f"rejected {subject}")
+		return {"id": f"draft-{subject}"}
+
+	def users(self):
+		return self
+
+	def drafts(self):
+		return self
+
+	def create(self, userId, body):
+		return FakeCreate(self, body)
+
+	def new_batch_http_request(self, callback):
+		return FakeBatch(self, callback)
+
+
+@pytest.fixture(autouse=True)
+def plain_bodies(monkeypatch):
+	# Keep the subject readable in the fake instead of decoding the MIME message
+	monkeypatch.setattr(
+		DraftWriter, "_draft_body", staticmethod(lambda to, subject, message: {"subject": subject})
+	)
+
+
+@pytest.mark.parametrize("count", [1, 2, 50, 51, 120])
+def test_drafts_cost_one_round_trip_per_batch(count):
+	gmail = FakeGmail()
+	writer = DraftWriter(gmail)
+	futures = [writer.add("to@example.com", str(i), "Hi") for i in range(count)]
+	assert writer.pending == count
+	assert gmail.round_trips == 0
+
+	draft_ids = writer.flush()
+
+	assert gmail.round_trips == math.ceil(count / MAX_BATCH_SIZE)
+	assert all(size <= MAX_BATCH_SIZE for size in gmail.batch_sizes)
+	assert [future.result() for future in futures] == [f"draft-{i}" for i in range(count)]
+	assert draft_ids == [f"draft-{i}" for i in range(count)]
+	assert writer.pending == 0
+
+
+def test_rejected_drafts_fail_their_own_future():
+	gmail = FakeGmail(rejected={"1", "3"})
+	writer = DraftWriter(gmail)
+	futures = [writer.add("to@example.com", str(i), "Hi") for i in range(5)]
+
+	draft_ids = writer.flush()
+
+	assert gmail.round_trips == 1
+	assert draft_ids == ["draft-0", "draft-2", "draft-4"]
+	for i, future in enumerate(futures):
+		if str(i) in gmail.rejected:
+			with pytest.raises(ValueError):
+				future.result()
+		else:
+			assert future.result() == f"draft-{i}"
+
+
+def test_a_failed_batch_fails_only_its_drafts():
+	gmail = FakeGmail(failed_batches={1})
+	writer = DraftWriter(gmail)
+	futures = [writer.add("to@example.com", str(i), "Hi") for i in range(MAX_BATCH_SIZE + 2)]
+
+	draft_ids = writer.flush()
+
+	assert gmail.round_trips == 2
+	assert draft_ids == [f"draft-{i}" for i in range(MAX_BATCH_SIZE, MAX_BATCH_SIZE + 2)]
+	assert all(isinstance(f.exception(), ConnectionError) for f in futures[:MAX_BATCH_SIZE])
+
+
+def test_recipients_are_only_answered_when_all_their_drafts_were_created():
+	gmail = FakeGmail(rejected={"2"})
+	writer = DraftWriter(gmail)
+	writer.add("Ann <Ann@example.com>", "1", "Hi")
+	writer.add("bob@example.com", "2", "Hi")
+	writer.add("ann@example.com", "3", "Hi")
+	writer.add("Bob <bob@example.com>", "4", "Hi")
+
+	drafted = writer.flush_by_recipient()
+
+	assert gmail.round_trips == 1
+	assert drafted == {"ann@example.com": True, "bob@example.com": False}
+	assert writer.pending == 0
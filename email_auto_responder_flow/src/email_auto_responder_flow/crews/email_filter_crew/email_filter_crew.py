@@ -1,11 +1,12 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai_tools import SerperDevTool
-from langchain_community.tools.gmail.get_thread import GmailGetThread
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_openai import ChatOpenAI
 
 from email_auto_responder_flow.tools.create_draft import CreateDraftTool
+from email_auto_responder_flow.tools.get_thread import CachedGmailGetThread
+from email_auto_responder_flow.utils.emails import get_gmail_api_resource
 
 
 @CrewBase
@@ -29,27 +30,25 @@ class EmailFilterCrew:
 
     @agent
     def email_action_agent(self) -> Agent:
-        gmail = GmailGetThread()
         return Agent(
             config=self.agents_config["email_action_agent"],
             llm=self.llm,
             verbose=True,
             tools=[
-                GmailGetThread(api_resource=gmail.api_resource),
+                CachedGmailGetThread(api_resource=get_gmail_api_resource()),
                 TavilySearchResults(),
             ],
         )
 
     @agent
     def email_response_writer(self) -> Agent:
-        gmail = GmailGetThread()
         return Agent(
             config=self.agents_config["email_response_writer"],
             llm=self.llm,
             verbose=True,
             tools=[
                 TavilySearchResults(),
-                GmailGetThread(api_resource=gmail.api_resource),
+                CachedGmailGetThread(api_resource=get_gmail_api_resource()),
                 CreateDraftTool.create_draft,
             ],
         )
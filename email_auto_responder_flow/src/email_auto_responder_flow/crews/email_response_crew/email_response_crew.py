@@ -0,0 +1,44 @@
+from crewai import Agent, Crew, Process, Task
+from crewai.project import CrewBase, agent, crew, task
+from langchain_community.tools.tavily_search import TavilySearchResults
+from langchain_openai import ChatOpenAI
+
+from email_auto_responder_flow.tools.create_draft import CreateDraftTool
+from email_auto_responder_flow.tools.get_thread import CachedGmailGetThread
+from email_auto_responder_flow.utils.emails import get_gmail_api_resource
+
+
+@CrewBase
+class EmailResponseCrew:
+    """Email Response Crew"""
+
+    agents_config = "config/agents.yaml"
+    tasks_config = "config/tasks.yaml"
+    llm = ChatOpenAI(model="gpt-4o")
+
+    @agent
+    def email_response_writer(self) -> Agent:
+        return Agent(
+            config=self.agents_config["email_response_writer"],
+            llm=self.llm,
+            verbose=True,
+            tools=[
+                TavilySearchResults(),
+                CachedGmailGetThread(api_resource=get_gmail_api_resource()),
+                CreateDraftTool.create_draft,
+            ],
+        )
+
+    @task
+    def draft_response_task(self) -> Task:
+        return Task(config=self.tasks_config["draft_response"])
+
+    @crew
+    def crew(self) -> Crew:
+        """Creates the Email Response Crew"""
+        return Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=True,
+        )
@@ -0,0 +1,42 @@
+from crewai import Agent, Crew, Process, Task
+from crewai.project import CrewBase, agent, crew, task
+from langchain_openai import ChatOpenAI
+
+from email_auto_responder_flow.tools.get_thread import CachedGmailGetThread
+from email_auto_responder_flow.types import EmailTriage
+from email_auto_responder_flow.utils.emails import get_gmail_api_resource
+
+
+@CrewBase
+class EmailTriageCrew:
+    """Email Triage Crew"""
+
+    agents_config = "config/agents.yaml"
+    tasks_config = "config/tasks.yaml"
+    llm = ChatOpenAI(model="gpt-4o")
+
+    @agent
+    def email_triage_agent(self) -> Agent:
+        return Agent(
+            config=self.agents_config["email_triage_agent"],
+            llm=self.llm,
+            verbose=True,
+            tools=[CachedGmailGetThread(api_resource=get_gmail_api_resource())],
+        )
+
+    @task
+    def triage_email_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["triage_email"],
+            output_pydantic=EmailTriage,
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        """Creates the Email Triage Crew"""
+        return Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=True,
+        )
@@ -1,19 +1,35 @@
 #!/usr/bin/env python
-import time
+import asyncio
+import os
 from typing import List
 
 from crewai.flow.flow import Flow, listen, start
 from pydantic import BaseModel
 
-from email_auto_responder_flow.types import Email
-from email_auto_responder_flow.utils.emails import check_email, format_emails
+from email_auto_responder_flow.types import Email, EmailTriageReport
+from email_auto_responder_flow.utils.draft_writer import email_address
+from email_auto_responder_flow.utils.emails import (
+    check_email,
+    current_mailbox,
+    format_emails,
+    get_draft_writer,
+    get_gmail_sync,
+    get_mailboxes,
+    get_seen_store,
+)
+from email_auto_responder_flow.utils.mailbox_scheduler import MailboxScheduler
+from email_auto_responder_flow.utils.thread_cache import get_thread_cache
+from email_auto_responder_flow.utils.triage import triage_emails
 
 from .crews.email_filter_crew.email_filter_crew import EmailFilterCrew
 
 
 class AutoResponderState(BaseModel):
+    mailbox: str = ""
     emails: List[Email] = []
-    checked_emails_ids: set[str] = set()
+    # Triage and answer every email on its own instead of in one crew run over the whole batch
+    triage_per_email: bool = os.environ.get("EMAIL_TRIAGE_MODE", "per_email") != "batch"
+    triage_reports: List[EmailTriageReport] = []
 
 
 class EmailAutoResponderFlow(Flow[AutoResponderState]):
@@ -22,34 +38,77 @@ class EmailAutoResponderFlow(Flow[AutoResponderState]):
     @start("wait_next_run")
     def fetch_new_emails(self):
         print("Kickoff the Email Filter Crew")
-        new_emails, updated_checked_email_ids = check_email(
-            checked_emails_ids=self.state.checked_emails_ids
+        # Handled email IDs are kept on disk, so restarts do not draft the same replies again
+        self.state.emails = check_email(
+            seen_emails=get_seen_store(), mailbox=self.state.mailbox
         )
 
-        self.state.emails = new_emails
-        self.state.checked_emails_ids = updated_checked_email_ids
-
     @listen(fetch_new_emails)
     def generate_draft_responses(self):
-        print("Current email queue: ", len(self.state.emails))
-        if len(self.state.emails) > 0:
+        handled = len(self.state.emails)
+        unanswered: List[str] = []
+        print("Current email queue: ", handled)
+        if handled > 0:
             print("Writing New emails")
-            emails = format_emails(self.state.emails)
-
-            EmailFilterCrew().crew().kickoff(inputs={"emails": emails})
+            current_mailbox.set(self.state.mailbox)
+            # Only mail whose replies made it to Gmail, or that needs none, counts as handled
+            if self.state.triage_per_email:
+                self.state.triage_reports = triage_emails(self.state.emails)
+                answered = [
+                    report.id
+                    for report in self.state.triage_reports
+                    if not report.error and (report.drafted or not report.action_required)
+                ]
+            else:
+                emails = format_emails(self.state.emails)
+                EmailFilterCrew().crew().kickoff(inputs={"emails": emails})
+                drafted = get_draft_writer(self.state.mailbox).flush_by_recipient()
+                # Drafts are matched to emails by their sender; an email without a draft needs none
+                answered = [
+                    email["id"]
+                    for email in self.state.emails
+                    if drafted.get(email_address(email["sender"]), True)
+                ]
+            get_seen_store().add(answered)
+            answered_ids = set(answered)
+            unanswered = [
+                email["id"] for email in self.state.emails if email["id"] not in answered_ids
+            ]
+            if unanswered:
+                print(f"## {len(unanswered)} emails were not answered, fetching them again next poll")
 
             self.state.emails = []
+            print("Gmail thread cache:", get_thread_cache().stats())
 
-        print("Waiting for 180 seconds")
-        time.sleep(180)
+        # Only now is the fetched mail dealt with, so the sync may move past it
+        get_gmail_sync(self.state.mailbox).commit(unanswered)
 
+        # The scheduler uses this to decide when to look at the mailbox again
+        return handled
 
-def kickoff():
+
+async def check_mailbox(mailbox: str) -> int:
     """
-    Run the flow.
+    Run the flow once for a mailbox, off the event loop so other mailboxes keep going.
     """
     email_auto_response_flow = EmailAutoResponderFlow()
-    email_auto_response_flow.kickoff()
+    return await asyncio.to_thread(
+        email_auto_response_flow.kickoff, inputs={"mailbox": mailbox}
+    )
+
+
+def kickoff():
+    """
+    Run the flow for every mailbox until interrupted.
+    """
+    scheduler = MailboxScheduler(
+        interval=float(os.environ.get("POLL_INTERVAL", 180)),
+        max_interval=float(os.environ.get("POLL_MAX_INTERVAL", 1800)),
+    )
+    for mailbox in get_mailboxes():
+        scheduler.add(mailbox, lambda mailbox=mailbox: check_mailbox(mailbox))
+    wake_port = os.environ.get("WAKE_PORT")
+    asyncio.run(scheduler.run(trigger_port=int(wake_port) if wake_port else None))
 
 
 def plot_flow():
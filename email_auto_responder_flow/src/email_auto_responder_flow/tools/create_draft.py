@@ -1,20 +1,20 @@
 from langchain.tools import tool
-from langchain_community.agent_toolkits import GmailToolkit
-from langchain_community.tools.gmail.create_draft import GmailCreateDraft
+
+from email_auto_responder_flow.utils.emails import get_draft_writer
 
 
 class CreateDraftTool:
     @tool("Create Draft")
-    def create_draft(data):
+    def create_draft(to: str, subject: str, message: str):
         """
-          Useful to create an email draft.
-        The input to this tool should be a pipe (|) separated text
-        of length 3 (three), representing who to send the email to,
-        the subject of the email and the actual message.
-        For example, `lorem@ipsum.com|Nice To Meet You|Hey it was great to meet you.`.
+        Useful to create an email draft.
+        The input to this tool is who to send the email to (`to`),
+        the subject of the email (`subject`) and the actual message (`message`).
+        For example, `to="lorem@ipsum.com"`, `subject="Nice To Meet You"`,
+        `message="Hey it was great to meet you."`.
         """
-        email, subject, message = data.split("|")
-        gmail = GmailToolkit()
-        draft = GmailCreateDraft(api_resource=gmail.api_resource)
-        result = draft({"to": [email], "subject": subject, "message": message})
-        return f"\nDraft created: {result}\n"
+        # Drafts go to the mailbox the running flow is working on, and are created in one batch
+        # once the crew is done
+        writer = get_draft_writer()
+        writer.add(to=to, subject=subject, message=message)
+        return f"\nDraft to {to} queued ({writer.pending} waiting to be created)\n"
@@ -0,0 +1,26 @@
+from typing import Dict, Optional
+
+from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_community.tools.gmail.get_thread import GmailGetThread
+
+from email_auto_responder_flow.utils.emails import current_mailbox, default_mailbox
+from email_auto_responder_flow.utils.thread_cache import get_thread_cache
+
+
+class CachedGmailGetThread(GmailGetThread):
+    """
+    GmailGetThread that serves threads from the process-wide thread cache when they are unchanged.
+    """
+
+    def _run(
+        self,
+        thread_id: str,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> Dict:
+        cache = get_thread_cache()
+        mailbox = current_mailbox.get() or default_mailbox()
+        thread = cache.get(mailbox, thread_id)
+        if thread is None:
+            thread = super()._run(thread_id, run_manager=run_manager)
+            cache.put(mailbox, thread_id, thread)
+        return thread
@@ -6,3 +6,19 @@ class Email(BaseModel):
     threadId: str
     snippet: str
     sender: str
+
+
+class EmailTriage(BaseModel):
+    id: str
+    threadId: str
+    action_required: bool
+    reason: str
+
+
+class EmailTriageReport(BaseModel):
+    id: str
+    action_required: bool
+    drafted: bool
+    latency: float
+    total_tokens: int
+    error: str = ""
@@ -1,28 +1,140 @@
 import os
-import time
-from typing import List
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Optional
 
-from langchain_community.agent_toolkits import GmailToolkit
-from langchain_community.tools.gmail.search import GmailSearch
+from langchain_community.tools.gmail.utils import (
+    build_resource_service,
+    get_gmail_credentials,
+)
 
 from email_auto_responder_flow.types import Email
+from email_auto_responder_flow.utils.draft_writer import DraftWriter
+from email_auto_responder_flow.utils.gmail_sync import GmailSync
+from email_auto_responder_flow.utils.seen_store import SeenStore
+from email_auto_responder_flow.utils.thread_cache import get_thread_cache
 
+# The mailbox the current flow run works on, so tools can act on the right account
+current_mailbox: ContextVar[str] = ContextVar("current_mailbox", default="")
 
-def check_email(checked_emails_ids: set[str]) -> tuple[list[Email], set[str]]:
-    print("# Checking for new emails")
+_credentials: Dict[str, object] = {}
+_credentials_lock = threading.Lock()
+# Gmail API resources talk over httplib2, which is not thread-safe, so every thread builds its own
+_thread_resources = threading.local()
+# The lazy singletons below are first asked for from concurrent threads, so each has its own lock
+_gmail_syncs: Dict[str, GmailSync] = {}
+_gmail_syncs_lock = threading.Lock()
+_draft_writers: Dict[str, DraftWriter] = {}
+_draft_writers_lock = threading.Lock()
+_seen_store: Optional[SeenStore] = None
+_seen_store_lock = threading.Lock()
 
-    gmail = GmailToolkit()
-    search = GmailSearch(api_resource=gmail.api_resource)
-    emails = search("after:newer_than:1d")
-    thread = []
+
+def default_mailbox() -> str:
+    return os.environ["MY_EMAIL"]
+
+
+def get_mailboxes() -> List[str]:
+    """
+    The mailboxes to watch, from the comma separated `MAILBOXES` setting or just `MY_EMAIL`.
+    """
+    mailboxes = os.environ.get("MAILBOXES") or default_mailbox()
+    return [mailbox.strip() for mailbox in mailboxes.split(",") if mailbox.strip()]
+
+
+def _get_credentials(mailbox: str) -> object:
+    """
+    Load the OAuth credentials of a mailbox once, they are shared by all of its API resources.
+
+    `MY_EMAIL` uses the default `token.json`; any other mailbox keeps its own `token.<mailbox>.json`.
+    """
+    with _credentials_lock:
+        if mailbox not in _credentials:
+            token_file = "token.json" if mailbox == default_mailbox() else f"token.{mailbox}.json"
+            _credentials[mailbox] = get_gmail_credentials(
+                token_file=token_file,
+                client_secrets_file="credentials.json",
+                scopes=["https://mail.google.com/"],
+            )
+        return _credentials[mailbox]
+
+
+def build_gmail_api_resource(mailbox: str = "") -> object:
+    """
+    Build a new Gmail API resource for a mailbox, for an owner that keeps it to itself.
+    """
+    mailbox = mailbox or current_mailbox.get() or default_mailbox()
+    return build_resource_service(credentials=_get_credentials(mailbox))
+
+
+def get_gmail_api_resource(mailbox: str = "") -> object:
+    """
+    Return the calling thread's Gmail API resource of a mailbox, shared by all code on the thread.
+    """
+    mailbox = mailbox or current_mailbox.get() or default_mailbox()
+    resources = getattr(_thread_resources, "resources", None)
+    if resources is None:
+        resources = _thread_resources.resources = {}
+    if mailbox not in resources:
+        resources[mailbox] = build_gmail_api_resource(mailbox)
+    return resources[mailbox]
+
+
+def get_gmail_sync(mailbox: str = "") -> GmailSync:
+    """
+    Return the Gmail sync engine of a mailbox, authenticating on first use.
+    """
+    mailbox = mailbox or default_mailbox()
+    with _gmail_syncs_lock:
+        if mailbox not in _gmail_syncs:
+            state_path = None if mailbox == default_mailbox() else f".gmail_sync.{mailbox}.json"
+            _gmail_syncs[mailbox] = GmailSync(
+                api_resource=build_gmail_api_resource(mailbox), state_path=state_path
+            )
+        return _gmail_syncs[mailbox]
+
+
+def get_draft_writer(mailbox: str = "") -> DraftWriter:
+    """
+    Return the draft writer of a mailbox, defaulting to the mailbox of the running flow.
+    """
+    mailbox = mailbox or current_mailbox.get() or default_mailbox()
+    with _draft_writers_lock:
+        if mailbox not in _draft_writers:
+            _draft_writers[mailbox] = DraftWriter(build_gmail_api_resource(mailbox))
+        return _draft_writers[mailbox]
+
+
+def get_seen_store() -> SeenStore:
+    """
+    Return the process-wide store of already handled email IDs.
+    """
+    global _seen_store
+    with _seen_store_lock:
+        if _seen_store is None:
+            _seen_store = SeenStore()
+        return _seen_store
+
+
+def check_email(seen_emails: SeenStore, mailbox: str = "") -> list[Email]:
+    mailbox = mailbox or default_mailbox()
+    print(f"# Checking for new emails in {mailbox}")
+
+    # Only the messages added since the previous poll are fetched
+    emails = get_gmail_sync(mailbox).fetch_new_messages()
+    # Messages come oldest first, so each thread ends up keyed by its newest message
+    thread_cache = get_thread_cache()
+    for email in emails:
+        thread_cache.note_message(mailbox, email["threadId"], email["id"])
+    threads = set()
     new_emails: List[Email] = []
     for email in emails:
         if (
-            (email["id"] not in checked_emails_ids)
-            and (email["threadId"] not in thread)
-            and (os.environ["MY_EMAIL"] not in email["sender"])
+            (email["id"] not in seen_emails)
+            and (email["threadId"] not in threads)
+            and (mailbox not in email["sender"])
         ):
-            thread.append(email["threadId"])
+            threads.add(email["threadId"])
             new_emails.append(
                 {
                     "id": email["id"],
@@ -31,14 +143,11 @@ def check_email(checked_emails_ids: set[str]) -> tuple[list[Email], set[str]]:
                     "sender": email["sender"],
                 }
             )
-    checked_emails_ids.update([email["id"] for email in emails])
-    return new_emails, checked_emails_ids
-
-
-def wait_next_run(state):
-    print("## Waiting for 180 seconds")
-    time.sleep(180)
-    return state
+    # Mail that needs no reply is done with; the rest is marked once its drafts are created
+    handled = {email["id"] for email in new_emails}
+    seen_emails.add(email["id"] for email in emails if email["id"] not in handled)
+    seen_emails.expire()
+    return new_emails
 
 
 def new_emails(state):
@@ -0,0 +1,139 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from googleapiclient.errors import HttpError
+from langchain_community.agent_toolkits import GmailToolkit
+
+# Messages in these labels are our own drafts and replies, never something to respond to
+SKIPPED_LABELS = {"DRAFT", "SENT"}
+
+
+class GmailSync:
+    """
+    Incremental Gmail sync based on history IDs.
+
+    The first sync lists the last day of mail, like the original search did, and remembers the
+    mailbox `historyId`. Later syncs only ask Gmail for the messages added since that ID, so each
+    poll costs a request per new message instead of re-downloading the whole day. One authenticated
+    API resource is reused for every call.
+
+    A fetch only moves the sync forward once `commit()` says its messages were handled. The history
+    ID is then persisted to `state_path`, together with the IDs of the messages that still need a
+    reply, so the next sync (or a restarted process) fetches those again. A run that dies before
+    committing starts over from the previous history ID.
+    """
+
+    def __init__(self, api_resource=None, state_path: Optional[str] = None):
+        self.api_resource = api_resource or GmailToolkit().api_resource
+        self.state_path = Path(
+            state_path or os.environ.get("GMAIL_SYNC_STATE", ".gmail_sync.json")
+        )
+        self.history_id, self.retry_ids = self._load_state()
+        # The history ID reached by the last fetch, saved by `commit()`
+        self._fetched_history_id: Optional[str] = None
+
+    def _load_state(self) -> tuple[Optional[str], list[str]]:
+        if not self.state_path.exists():
+            return None, []
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state.get("history_id"), state.get("retry_ids", [])
+
+    def _save_state(self, history_id: str, retry_ids: list[str]):
+        self.history_id = history_id
+        self.retry_ids = retry_ids
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"history_id": history_id, "retry_ids": retry_ids}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def fetch_new_messages(self) -> List[dict]:
+        """
+        Return the messages added since the last sync as dicts with id, threadId, snippet and sender.
+
+        Messages a previous sync left unanswered come first. Call `commit()` once they are handled.
+        """
+        if self.history_id is None:
+            message_ids, history_id = self._full_sync()
+        else:
+            try:
+                message_ids, history_id = self._partial_sync(self.history_id)
+            except HttpError as e:
+                # Gmail only keeps history for a limited time, a stale ID answers 404
+                if e.resp.status != 404:
+                    raise
+                print("## Gmail history expired, running a full sync")
+                message_ids, history_id = self._full_sync()
+
+        message_ids = list(dict.fromkeys(self.retry_ids + message_ids))
+        messages = [message for message in map(self._get_message, message_ids) if message]
+        self._fetched_history_id = history_id
+        return messages
+
+    def commit(self, unanswered_ids: Iterable[str] = ()):
+        """
+        Move the sync past the last fetch; `unanswered_ids` are fetched again by the next sync.
+        """
+        if self._fetched_history_id is None:
+            return
+        self._save_state(self._fetched_history_id, list(dict.fromkeys(unanswered_ids)))
+        self._fetched_history_id = None
+
+    def _full_sync(self) -> tuple[list[str], str]:
+        users = self.api_resource.users()
+        # Read the history ID first so nothing that arrives while listing is missed
+        history_id = users.getProfile(userId="me").execute()["historyId"]
+        message_ids = []
+        request = users.messages().list(userId="me", q="newer_than:1d")
+        while request is not None:
+            response = request.execute()
+            message_ids.extend(message["id"] for message in response.get("messages", []))
+            request = users.messages().list_next(request, response)
+        # The list is newest first, history records are oldest first
+        message_ids.reverse()
+        return message_ids, history_id
+
+    def _partial_sync(self, start_history_id: str) -> tuple[list[str], str]:
+        history = self.api_resource.users().history()
+        message_ids = []
+        history_id = start_history_id
+        request = history.list(
+            userId="me", startHistoryId=start_history_id, historyTypes=["messageAdded"]
+        )
+        while request is not None:
+            response = request.execute()
+            history_id = response.get("historyId", history_id)
+            for record in response.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    message = added["message"]
+                    if not SKIPPED_LABELS.intersection(message.get("labelIds", [])):
+                        message_ids.append(message["id"])
+            request = history.list_next(request, response)
+        # A message can show up in several history records
+        return list(dict.fromkeys(message_ids)), history_id
+
+    def _get_message(self, message_id: str) -> Optional[dict]:
+        try:
+            message = (
+                self.api_resource.users()
+                .messages()
+                .get(userId="me", id=message_id, format="metadata", metadataHeaders=["From"])
+                .execute()
+            )
+        except HttpError as e:
+            # The message was deleted between the history call and now
+            if e.resp.status == 404:
+                return None
+            raise
+        if SKIPPED_LABELS.intersection(message.get("labelIds", [])):
+            return None
+        headers = message.get("payload", {}).get("headers", [])
+        sender = next((h["value"] for h in headers if h["name"].lower() == "from"), "")
+        return {
+            "id": message["id"],
+            "threadId": message["threadId"],
+            "snippet": message.get("snippet", ""),
+            "sender": sender,
+        }
@@ -0,0 +1,127 @@
+import asyncio
+import base64
+import json
+import random
+from typing import Awaitable, Callable, Dict, Optional
+
+Poll = Callable[[], Awaitable[int]]
+
+
+class MailboxScheduler:
+    """
+    Drives any number of mailboxes from a single asyncio event loop.
+
+    Every mailbox is polled on its own jittered interval. A poll returns how many new emails it
+    handled; while a mailbox stays idle its interval doubles up to `max_interval`, and as soon as
+    mail shows up it drops back to `interval`. A mailbox can also be woken right away, either by
+    calling `wake()` or through the optional local HTTP trigger started by `run()`:
+
+        curl -X POST http://127.0.0.1:<port>/wake/me@example.com
+        curl -X POST http://127.0.0.1:<port>/wake          # every mailbox
+
+    Gmail push notifications (Pub/Sub push subscriptions) posted to `/wake` wake the mailbox named
+    in the notification.
+    """
+
+    def __init__(self, interval: float = 180, max_interval: float = 1800, jitter: float = 0.2):
+        self.interval = interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self._polls: Dict[str, Poll] = {}
+        self._wake_events: Dict[str, asyncio.Event] = {}
+
+    def add(self, mailbox: str, poll: Poll):
+        self._polls[mailbox] = poll
+        self._wake_events[mailbox] = asyncio.Event()
+
+    def wake(self, mailbox: Optional[str] = None) -> bool:
+        """
+        Wake one mailbox, or all of them when `mailbox` is None.
+        """
+        if mailbox is None:
+            for event in self._wake_events.values():
+                event.set()
+            return True
+        event = self._wake_events.get(mailbox)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _watch(self, mailbox: str, poll: Poll):
+        wake_event = self._wake_events[mailbox]
+        interval = self.interval
+        # Spread the first polls out so mailboxes do not all hit the API at once
+        await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+        while True:
+            wake_event.clear()
+            try:
+                handled = await poll()
+            except Exception as e:
+                print(f"## [{mailbox}] Poll failed: {e}")
+                handled = 0
+            if handled:
+                interval = self.interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+            delay = self._jittered(interval)
+            print(f"## [{mailbox}] Next check in {delay:.0f} seconds unless woken")
+            try:
+                await asyncio.wait_for(wake_event.wait(), timeout=delay)
+                print(f"## [{mailbox}] Woken up")
+                interval = self.interval
+            except asyncio.TimeoutError:
+                pass
+
+    async def _handle_trigger(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            content_length = 0
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    content_length = int(value.strip())
+            body = await reader.readexactly(content_length) if content_length else b""
+
+            path = request_line[1] if len(request_line) > 1 else ""
+            if path.startswith("/wake/"):
+                woken = self.wake(path[len("/wake/") :])
+            elif path == "/wake":
+                woken = self.wake(self._push_notification_mailbox(body))
+            else:
+                woken = False
+            status = "202 Accepted" if woken else "404 Not Found"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _push_notification_mailbox(body: bytes) -> Optional[str]:
+        """
+        Extract the mailbox from a Gmail Pub/Sub push notification, if the body is one.
+        """
+        try:
+            data = json.loads(body)["message"]["data"]
+            return json.loads(base64.b64decode(data))["emailAddress"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    async def run(self, trigger_host: str = "127.0.0.1", trigger_port: Optional[int] = None):
+        """
+        Poll every mailbox until cancelled, optionally serving the wake-up trigger on `trigger_port`.
+        """
+        watchers = [self._watch(mailbox, poll) for mailbox, poll in self._polls.items()]
+        if trigger_port is None:
+            await asyncio.gather(*watchers)
+            return
+        server = await asyncio.start_server(self._handle_trigger, trigger_host, trigger_port)
+        print(f"## Listening for wake-ups on http://{trigger_host}:{trigger_port}/wake")
+        async with server:
+            await asyncio.gather(server.serve_forever(), *watchers)
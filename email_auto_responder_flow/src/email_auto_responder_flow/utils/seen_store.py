@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+
+class SeenStore:
+    """
+    Persistent, time-windowed set of email IDs that have already been handled.
+
+    IDs live in a SQLite table and expire after `ttl` seconds, which keeps the store bounded while
+    staying well past the one-day search window. Membership checks are indexed lookups instead of
+    scans, and because the store is on disk a restarted process does not draft replies to mail it
+    already handled. The connection is shared by every thread, so each statement runs under a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path or os.environ.get("SEEN_EMAILS_DB", ".seen_emails.sqlite3")
+        self.ttl = ttl or float(os.environ.get("SEEN_EMAILS_TTL_DAYS", 7)) * 24 * 60 * 60
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_emails (
+                id TEXT PRIMARY KEY,
+                seen_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS seen_emails_seen_at ON seen_emails (seen_at)"
+        )
+        self._conn.commit()
+        self.expire()
+
+    def __contains__(self, email_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM seen_emails WHERE id = ? AND seen_at >= ?",
+                (email_id, time.time() - self.ttl),
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_emails").fetchone()[0]
+
+    def add(self, email_ids: Iterable[str]):
+        now = time.time()
+        rows = [(email_id, now) for email_id in email_ids]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen_emails (id, seen_at) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def expire(self):
+        """
+        Drop the IDs that fell out of the window.
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM seen_emails WHERE seen_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class ThreadCache:
+    """
+    In-memory LRU cache of fetched Gmail threads, keyed by mailbox, thread ID and last message ID.
+
+    The mailbox sync records the newest message it has seen in each thread with `note_message()`.
+    A thread is served from the cache as long as that message is still the last one fetched, so
+    agents reading the same thread within a run, and later polls of the same process, stop calling
+    the API again. A new message in the thread changes the key and the thread is fetched fresh.
+    Threads are kept apart per mailbox, since every account sees its own copy of a thread. The
+    cache is capped at `max_bytes` of serialized thread data, dropping the least recently used
+    threads first. Nothing is persisted, so a restarted process starts with an empty cache.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes or int(
+            os.environ.get("GMAIL_THREAD_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+        )
+        self._threads: "OrderedDict[Tuple[str, str, str], Tuple[dict, int]]" = OrderedDict()
+        self._latest: Dict[Tuple[str, str], str] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def note_message(self, mailbox: str, thread_id: str, message_id: str):
+        """
+        Record the newest known message of a thread.
+        """
+        with self._lock:
+            self._latest[(mailbox, thread_id)] = message_id
+
+    def get(self, mailbox: str, thread_id: str) -> Optional[dict]:
+        with self._lock:
+            key = (mailbox, thread_id, self._latest.get((mailbox, thread_id)))
+            entry = self._threads.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._threads.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, mailbox: str, thread_id: str, thread: dict):
+        messages = thread.get("messages") or []
+        if not messages:
+            return
+        size = len(json.dumps(thread))
+        if size > self.max_bytes:
+            return
+        key = (mailbox, thread_id, messages[-1]["id"])
+        with self._lock:
+            # Older versions of the thread can never be served again
+            for old_key in [k for k in self._threads if k[:2] == key[:2]]:
+                self._bytes -= self._threads.pop(old_key)[1]
+            self._threads[key] = (thread, size)
+            self._latest[key[:2]] = key[2]
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted_key, (_, evicted_size) = self._threads.popitem(last=False)
+                self._latest.pop(evicted_key[:2], None)
+                self._bytes -= evicted_size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "threads": len(self._threads),
+                "bytes": self._bytes,
+            }
+
+
+_thread_cache: Optional[ThreadCache] = None
+
+
+def get_thread_cache() -> ThreadCache:
+    """
+    Return the process-wide thread cache shared by every agent and poll.
+    """
+    global _thread_cache
+    if _thread_cache is None:
+        _thread_cache = ThreadCache()
+    return _thread_cache
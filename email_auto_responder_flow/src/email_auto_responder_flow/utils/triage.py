@@ -0,0 +1,99 @@
+import contextvars
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
+
+from email_auto_responder_flow.crews.email_response_crew.email_response_crew import (
+    EmailResponseCrew,
+)
+from email_auto_responder_flow.crews.email_triage_crew.email_triage_crew import (
+    EmailTriageCrew,
+)
+from email_auto_responder_flow.types import Email, EmailTriageReport
+from email_auto_responder_flow.utils.draft_writer import collect_drafts
+from email_auto_responder_flow.utils.emails import get_draft_writer
+
+
+def _total_tokens(crew_output) -> int:
+    usage = getattr(crew_output, "token_usage", None)
+    return getattr(usage, "total_tokens", 0) or 0
+
+
+def triage_email(email: Email) -> Tuple[EmailTriageReport, List[Future]]:
+    """
+    Triage one email and draft a response only when it needs one.
+
+    Returns the report along with the futures of the drafts the response crew queued; the report
+    is only marked as drafted by `triage_emails()` once those drafts have been created.
+    """
+    inputs = {
+        "id": email["id"],
+        "thread_id": email["threadId"],
+        "sender": email["sender"],
+        "snippet": email["snippet"],
+    }
+    started = time.perf_counter()
+    tokens = 0
+    action_required = False
+    drafts: List[Future] = []
+    try:
+        triage_output = EmailTriageCrew().crew().kickoff(inputs=inputs)
+        tokens += _total_tokens(triage_output)
+        triage = triage_output.pydantic
+        action_required = triage.action_required
+        if action_required:
+            with collect_drafts() as drafts:
+                response_output = EmailResponseCrew().crew().kickoff(
+                    inputs={**inputs, "reason": triage.reason}
+                )
+            tokens += _total_tokens(response_output)
+        error = ""
+    except Exception as e:
+        # One bad email should not take the rest of the batch down with it
+        error = str(e)
+    report = EmailTriageReport(
+        id=email["id"],
+        action_required=action_required,
+        drafted=False,
+        latency=time.perf_counter() - started,
+        total_tokens=tokens,
+        error=error,
+    )
+    return report, drafts
+
+
+def triage_emails(emails: List[Email], max_workers: int = 0) -> List[EmailTriageReport]:
+    """
+    Triage every email on its own, concurrently on a bounded pool, in the order given.
+
+    `max_workers` defaults to the `EMAIL_TRIAGE_WORKERS` setting (4).
+    """
+    max_workers = max_workers or int(os.environ.get("EMAIL_TRIAGE_WORKERS", 4))
+    # Authenticate the writer before the workers start queueing drafts on it
+    writer = get_draft_writer()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Every email gets its own copy of the context so tools still see the current mailbox
+        futures = [
+            executor.submit(contextvars.copy_context().run, triage_email, email)
+            for email in emails
+        ]
+        results = [future.result() for future in futures]
+
+    # The response crews only queued their drafts, create them all in one go
+    writer.flush()
+    reports = []
+    for report, drafts in results:
+        report.drafted = bool(drafts) and all(
+            draft.done() and draft.exception() is None for draft in drafts
+        )
+        reports.append(report)
+        status = "drafted" if report.drafted else "no action"
+        if report.action_required and not report.drafted:
+            status = "no draft created"
+        if report.error:
+            status = f"failed: {report.error}"
+        print(
+            f"## Email {report.id}: {status} in {report.latency:.1f}s, {report.total_tokens} tokens"
+        )
+    return reports
@@ -6,6 +6,8 @@ from crewai import Agent, Crew
 
 from tasks import MarketingAnalysisTasks
 from agents import MarketingAnalysisAgents
+from tools.page_cache import get_page_cache
+from tools.search_cache import get_search_cache
 
 tasks = MarketingAnalysisTasks()
 agents = MarketingAnalysisAgents()
@@ -73,3 +75,6 @@ print("Your post copy:")
 print(ad_copy)
 print("'\n\nYour midjourney description:")
 print(image)
+print("\n## Cache statistics")
+print(f"Search results: {get_search_cache().stats()}")
+print(f"Scraped pages:  {get_page_cache().stats()}")
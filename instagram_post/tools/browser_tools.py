@@ -1,11 +1,17 @@
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from crewai import Agent, Task
 from langchain.tools import tool
 from unstructured.partition.html import partition_html
 
+from tools.chunker import chunk_elements
+from tools.http_session import get_session
+from tools.page_cache import get_page_cache
+
 from langchain.llms import Ollama
 
 class BrowserTools():
@@ -14,29 +20,100 @@ class BrowserTools():
   def scrape_and_summarize_website(website):
     """Useful to scrape and summarize a website content, just pass a string with
     only the full url, no need for a final slash `/`, eg: https://google.com or https://clearbit.com/about-us"""
+    elements = partition_html(text=BrowserTools.fetch(website))
+    content = chunk_elements(
+        elements,
+        max_tokens=int(os.environ.get('SCRAPE_CHUNK_TOKENS', 2000)),
+        overlap_tokens=int(os.environ.get('SCRAPE_CHUNK_OVERLAP', 0)))
+    content = BrowserTools.summarize(content)
+    return f'\nScrapped Content: {content}\n'
+
+  def fetch(website):
+    """Returns the page HTML, scraping it through browserless only when the
+    page cache has no fresh copy."""
+    cache = get_page_cache()
+    html = cache.get_page(
+        website, lambda etag, last_modified: BrowserTools.unchanged(
+            website, etag, last_modified))
+    if html is not None:
+      return html
     url = f"https://chrome.browserless.io/content?token={os.environ['BROWSERLESS_API_KEY']}"
     payload = json.dumps({"url": website})
     headers = {'cache-control': 'no-cache', 'content-type': 'application/json'}
-    response = requests.request("POST", url, headers=headers, data=payload)
-    elements = partition_html(text=response.text)
-    content = "\n\n".join([str(el) for el in elements])
-    content = [content[i:i + 8000] for i in range(0, len(content), 8000)]
-    summaries = []
-    for chunk in content:
-      agent = Agent(
-          role='Principal Researcher',
-          goal=
-          'Do amazing researches and summaries based on the content you are working with',
-          backstory=
-          "You're a Principal Researcher at a big company and you need to do a research about a given topic.",
-          llm=Ollama(model=os.environ['MODEL']),
-          allow_delegation=False)
-      task = Task(
-          agent=agent,
-          description=
+    response = get_session().post(url, headers=headers, data=payload)
+    if response.ok:
+      cache.set_page(website, response.text, *BrowserTools.validators(website))
+    return response.text
+
+  def validators(website):
+    """Returns the ETag and Last-Modified headers the origin sends for the
+    page, if any. This costs an extra request to the origin on every miss, so
+    it only runs with PAGE_CACHE_REVALIDATE=1; otherwise stale pages are
+    simply scraped again."""
+    if os.environ.get('PAGE_CACHE_REVALIDATE', '0') != '1':
+      return None, None
+    try:
+      response = get_session().head(website, allow_redirects=True)
+    except requests.RequestException:
+      return None, None
+    return response.headers.get('etag'), response.headers.get('last-modified')
+
+  def unchanged(website, etag, last_modified):
+    """Asks the origin whether the page changed since it was cached."""
+    headers = {}
+    if etag:
+      headers['If-None-Match'] = etag
+    if last_modified:
+      headers['If-Modified-Since'] = last_modified
+    try:
+      response = get_session().head(website, headers=headers,
+                                    allow_redirects=True)
+    except requests.RequestException:
+      return False
+    return response.status_code == 304
+
+  def summarize(chunks):
+    """Summarizes the chunks concurrently, then merges the partial summaries
+    in a single reduce step. Set SCRAPE_SUMMARY_WORKERS=1 to run serially.
+    Summaries are cached by prompt, so unchanged chunks skip the LLM."""
+    cache = get_page_cache()
+    # An Agent keeps per-run executor state, so every worker thread gets its own
+    agents = threading.local()
+
+    def get_agent():
+      if not hasattr(agents, 'agent'):
+        agents.agent = Agent(
+            role='Principal Researcher',
+            goal=
+            'Do amazing researches and summaries based on the content you are working with',
+            backstory=
+            "You're a Principal Researcher at a big company and you need to do a research about a given topic.",
+            llm=Ollama(model=os.environ['MODEL']),
+            allow_delegation=False)
+      return agents.agent
+
+    # Summaries written by another model are not reused
+    model = os.environ['MODEL']
+
+    def execute(description):
+      summary = cache.get_summary(description, model)
+      if summary is None:
+        summary = Task(agent=get_agent(), description=description).execute()
+        cache.set_summary(description, summary, model)
+      return summary
+
+    def summarize_chunk(chunk):
+      return execute(
           f'Analyze and make a LONG summary the content bellow, make sure to include the ALL relevant information in the summary, return only the summary nothing else.\n\nCONTENT\n----------\n{chunk}'
       )
-      summary = task.execute()
-      summaries.append(summary)
-      content = "\n\n".join(summaries)
-    return f'\nScrapped Content: {content}\n'
+
+    max_workers = int(os.environ.get('SCRAPE_SUMMARY_WORKERS', 4))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+      # map keeps the summaries in the same order as the chunks
+      summaries = list(pool.map(summarize_chunk, chunks))
+    if len(summaries) <= 1:
+      return "\n\n".join(summaries)
+    summaries = "\n\n----------\n\n".join(summaries)
+    return execute(
+        f'Combine the partial summaries bellow, written in the order the content appears on the page, into a single LONG summary, make sure to keep ALL the relevant information, return only the summary nothing else.\n\nSUMMARIES\n----------\n{summaries}'
+    )
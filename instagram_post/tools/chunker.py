@@ -0,0 +1,113 @@
+import threading
+
+SEPARATOR = "\n\n"
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+  """Loads the tiktoken encoding on first use. tiktoken downloads the BPE
+  file the first time, so any failure (missing package, no network) falls
+  back to the character estimate instead of breaking the import."""
+  global _encoding, _encoding_loaded
+  with _encoding_lock:
+    if not _encoding_loaded:
+      try:
+        import tiktoken
+        _encoding = tiktoken.get_encoding("cl100k_base")
+      except Exception:
+        _encoding = None
+      _encoding_loaded = True
+  return _encoding
+
+
+def count_tokens(text):
+  """Counts tokens with tiktoken when available, otherwise estimates them
+  at roughly four characters per token, rounding up so the estimates of the
+  parts of a chunk never add up to less than the chunk's own."""
+  encoding = _get_encoding()
+  if encoding is not None:
+    return len(encoding.encode(text, disallowed_special=()))
+  return max(1, -(-len(text) // 4))
+
+
+def _hard_split(text, max_tokens):
+  """Slices text with no usable word boundary into pieces of at most
+  `max_tokens` tokens."""
+  encoding = _get_encoding()
+  if encoding is not None:
+    ids = encoding.encode(text, disallowed_special=())
+    for start in range(0, len(ids), max_tokens):
+      yield encoding.decode(ids[start:start + max_tokens])
+  else:
+    size = max_tokens * 4
+    for start in range(0, len(text), size):
+      yield text[start:start + size]
+
+
+def _split_oversized(text, max_tokens):
+  """Splits a single element that is larger than the budget on word
+  boundaries, slicing any single word that is still over the budget."""
+  piece, piece_tokens = [], 0
+  for word in text.split(" "):
+    word_tokens = count_tokens(word + " ")
+    if piece and piece_tokens + word_tokens > max_tokens:
+      yield " ".join(piece)
+      piece, piece_tokens = [], 0
+    if word_tokens > max_tokens:
+      yield from _hard_split(word, max_tokens)
+      continue
+    piece.append(word)
+    piece_tokens += word_tokens
+  if piece:
+    yield " ".join(piece)
+
+
+def chunk_elements(elements, max_tokens=2000, overlap_tokens=0):
+  """Packs whole `partition_html` elements into chunks of at most
+  `max_tokens` tokens, counting the separators between them.
+
+  Elements are only split when a single one exceeds the budget. When
+  `overlap_tokens` is set, the trailing elements of a chunk that fit in that
+  many tokens are repeated at the start of the next one. Elements are
+  consumed lazily and each chunk is yielded as soon as it is full.
+  """
+  separator_tokens = count_tokens(SEPARATOR)
+  chunk, chunk_tokens = [], 0
+  for element in elements:
+    text = str(element).strip()
+    if not text:
+      continue
+    tokens = count_tokens(text)
+    pieces = [(text, tokens)]
+    if tokens > max_tokens:
+      pieces = [(piece, count_tokens(piece))
+                for piece in _split_oversized(text, max_tokens)]
+    for piece, piece_tokens in pieces:
+      if chunk and chunk_tokens + separator_tokens + piece_tokens > max_tokens:
+        yield SEPARATOR.join(part for part, _ in chunk)
+        chunk, chunk_tokens = _overlap(
+            chunk, overlap_tokens,
+            max_tokens - piece_tokens - separator_tokens, separator_tokens)
+      if chunk:
+        chunk_tokens += separator_tokens
+      chunk.append((piece, piece_tokens))
+      chunk_tokens += piece_tokens
+  if chunk:
+    yield SEPARATOR.join(part for part, _ in chunk)
+
+
+def _overlap(chunk, overlap_tokens, room, separator_tokens):
+  """Returns the tail of `chunk` that fits in both the overlap and the room
+  left for the next element, separators included."""
+  limit = min(overlap_tokens, room)
+  tail, tail_tokens = [], 0
+  for text, tokens in reversed(chunk):
+    cost = tokens + (separator_tokens if tail else 0)
+    if tail_tokens + cost > limit:
+      break
+    tail.insert(0, (text, tokens))
+    tail_tokens += cost
+  return tail, tail_tokens
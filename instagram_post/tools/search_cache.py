@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SearchCache():
+  """On-disk cache of search results backed by SQLite.
+
+  Entries are keyed by a hash of the normalized query and the number of
+  results requested. Entries older than `ttl` seconds are treated as misses,
+  and once the stored payloads exceed `max_bytes` the least recently used
+  entries are evicted.
+  """
+
+  def __init__(self, path, ttl=24 * 60 * 60, max_bytes=32 * 1024 * 1024):
+    self.path = path
+    self.ttl = ttl
+    self.max_bytes = max_bytes
+    self.hits = 0
+    self.misses = 0
+    self._lock = threading.Lock()
+    directory = os.path.dirname(path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    self._conn = sqlite3.connect(path, check_same_thread=False)
+    self._conn.execute("""
+      CREATE TABLE IF NOT EXISTS search_cache (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+      )""")
+    self._conn.execute(
+        "CREATE INDEX IF NOT EXISTS search_cache_accessed_at "
+        "ON search_cache (accessed_at)")
+    self._conn.commit()
+
+  @staticmethod
+  def key(query, n_results):
+    normalized = " ".join(query.lower().split())
+    raw = json.dumps({"q": normalized, "n": n_results}, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+  def get(self, query, n_results):
+    key = self.key(query, n_results)
+    now = time.time()
+    with self._lock:
+      row = self._conn.execute(
+          "SELECT value, created_at FROM search_cache WHERE key = ?",
+          (key, )).fetchone()
+      if row is None or now - row[1] > self.ttl:
+        if row is not None:
+          self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key, ))
+          self._conn.commit()
+        self.misses += 1
+        return None
+      self._conn.execute(
+          "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+      self._conn.commit()
+      self.hits += 1
+      return json.loads(row[0])
+
+  def set(self, query, n_results, value):
+    key = self.key(query, n_results)
+    payload = json.dumps(value)
+    now = time.time()
+    with self._lock:
+      self._conn.execute(
+          "INSERT OR REPLACE INTO search_cache "
+          "(key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+          (key, payload, len(payload), now, now))
+      self._evict(now)
+      self._conn.commit()
+
+  def _evict(self, now):
+    self._conn.execute("DELETE FROM search_cache WHERE created_at < ?",
+                       (now - self.ttl, ))
+    total = self._conn.execute(
+        "SELECT COALESCE(SUM(size), 0) FROM search_cache").fetchone()[0]
+    if total <= self.max_bytes:
+      return
+    rows = self._conn.execute(
+        "SELECT key, size FROM search_cache ORDER BY accessed_at ASC").fetchall()
+    stale = []
+    for key, size in rows:
+      if total <= self.max_bytes:
+        break
+      stale.append((key, ))
+      total -= size
+    self._conn.executemany("DELETE FROM search_cache WHERE key = ?", stale)
+
+  def stats(self):
+    with self._lock:
+      entries, size = self._conn.execute(
+          "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+    return {
+        "hits": self.hits,
+        "misses": self.misses,
+        "entries": entries,
+        "bytes": size
+    }
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+  """Returns the process-wide search cache, creating it on first use."""
+  global _search_cache
+  with _search_cache_lock:
+    if _search_cache is None:
+      _search_cache = SearchCache(
+          os.environ.get('SEARCH_CACHE_PATH', '.cache/search_cache.sqlite3'),
+          ttl=int(os.environ.get('SEARCH_CACHE_TTL', 24 * 60 * 60)),
+          max_bytes=int(
+              os.environ.get('SEARCH_CACHE_MAX_BYTES', 32 * 1024 * 1024)))
+    return _search_cache
@@ -1,9 +1,11 @@
 import json
 import os
 
-import requests
 from langchain.tools import tool
 
+from tools.http_session import get_session
+from tools.search_cache import get_search_cache
+
 
 class SearchTools():
 
@@ -21,16 +23,20 @@ class SearchTools():
     return SearchTools.search(query)
 
   def search(query, n_results=5):
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
-    headers = {
-        'X-API-KEY': os.environ['SERPER_API_KEY'],
-        'content-type': 'application/json'
-    }
-    response = requests.request("POST", url, headers=headers, data=payload)
-    results = response.json()['organic']
+    cache = get_search_cache()
+    results = cache.get(query, n_results)
+    if results is None:
+      url = "https://google.serper.dev/search"
+      payload = json.dumps({"q": query})
+      headers = {
+          'X-API-KEY': os.environ['SERPER_API_KEY'],
+          'content-type': 'application/json'
+      }
+      response = get_session().post(url, headers=headers, data=payload)
+      results = response.json()['organic'][:n_results]
+      cache.set(query, n_results, results)
     stirng = []
-    for result in results[:n_results]:
+    for result in results:
       try:
         stirng.append('\n'.join([
             f"Title: {result['title']}", f"Link: {result['link']}",
@@ -41,4 +47,3 @@ class SearchTools():
 
     content = '\n'.join(stirng)
     return f"\nSearch result: {content}\n"
-
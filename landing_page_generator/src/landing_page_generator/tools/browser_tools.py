@@ -1,11 +1,15 @@
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
 from crewai import Agent, Task
 from langchain.tools import tool
 from unstructured.partition.html import partition_html
 
+from tools.chunker import chunk_elements
+from tools.http_session import get_session
+
 
 class BrowserTools():
 
@@ -15,24 +19,49 @@ class BrowserTools():
     url = f"https://chrome.browserless.io/content?token={os.environ['BROWSERLESS_API_KEY']}"
     payload = json.dumps({"url": website})
     headers = {'cache-control': 'no-cache', 'content-type': 'application/json'}
-    response = requests.request("POST", url, headers=headers, data=payload)
+    response = get_session().post(url, headers=headers, data=payload)
     elements = partition_html(text=response.text)
-    content = "\n\n".join([str(el) for el in elements])
-    content = [content[i:i + 8000] for i in range(0, len(content), 8000)]
-    summaries = []
-    for chunk in content:
-      agent = Agent(
-          role='Principal Researcher',
-          goal=
-          'Do amazing researches and summaries based on the content you are working with',
-          backstory=
-          "You're a Principal Researcher at a big company and you need to do a research about a given topic.",
-          allow_delegation=False)
+    content = chunk_elements(
+        elements,
+        max_tokens=int(os.environ.get('SCRAPE_CHUNK_TOKENS', 2000)),
+        overlap_tokens=int(os.environ.get('SCRAPE_CHUNK_OVERLAP', 0)))
+    return BrowserTools.summarize(content)
+
+  def summarize(chunks):
+    """Summarizes the chunks concurrently, then merges the partial summaries
+    in a single reduce step. Set SCRAPE_SUMMARY_WORKERS=1 to run serially."""
+    # An Agent keeps per-run executor state, so every worker thread gets its own
+    agents = threading.local()
+
+    def get_agent():
+      if not hasattr(agents, 'agent'):
+        agents.agent = Agent(
+            role='Principal Researcher',
+            goal=
+            'Do amazing researches and summaries based on the content you are working with',
+            backstory=
+            "You're a Principal Researcher at a big company and you need to do a research about a given topic.",
+            allow_delegation=False)
+      return agents.agent
+
+    def summarize_chunk(chunk):
       task = Task(
-          agent=agent,
+          agent=get_agent(),
           description=
           f'Analyze and summarize the content bellow, make sure to include the most relevant information in the summary, return only the summary nothing else.\n\nCONTENT\n----------\n{chunk}'
       )
-      summary = task.execute()
-      summaries.append(summary)
-    return "\n\n".join(summaries)
+      return task.execute()
+
+    max_workers = int(os.environ.get('SCRAPE_SUMMARY_WORKERS', 4))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+      # map keeps the summaries in the same order as the chunks
+      summaries = list(pool.map(summarize_chunk, chunks))
+    if len(summaries) <= 1:
+      return "\n\n".join(summaries)
+    summaries = "\n\n----------\n\n".join(summaries)
+    task = Task(
+        agent=get_agent(),
+        description=
+        f'Combine the partial summaries bellow, written in the order the content appears on the page, into a single summary, make sure to keep the most relevant information, return only the summary nothing else.\n\nSUMMARIES\n----------\n{summaries}'
+    )
+    return task.execute()
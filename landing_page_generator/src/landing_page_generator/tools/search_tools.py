@@ -1,8 +1,10 @@
 import os
 import json
-import requests
 from langchain.tools import tool
 
+from tools.http_session import get_session
+from tools.search_cache import get_search_cache
+
 
 class SearchTools():
 
@@ -10,14 +12,18 @@ class SearchTools():
   def search_internet(query):
     """Useful to search the internet 
     about a a given topic and return relevant results"""
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
-    headers = {
-        'X-API-KEY': os.environ['SERPER_API_KEY'],
-        'content-type': 'application/json'
-    }
-    response = requests.request("POST", url, headers=headers, data=payload)
-    results = response.json()['organic']
+    cache = get_search_cache()
+    results = cache.get(query, None)
+    if results is None:
+      url = "https://google.serper.dev/search"
+      payload = json.dumps({"q": query})
+      headers = {
+          'X-API-KEY': os.environ['SERPER_API_KEY'],
+          'content-type': 'application/json'
+      }
+      response = get_session().post(url, headers=headers, data=payload)
+      results = response.json()['organic']
+      cache.set(query, None, results)
     string = []
     for result in results:
       string.append('\n'.join([
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the per-candidate crew setup cost.
+
+Compares building a fresh crew from YAML for every candidate with checking one out of a CrewPool.
+Nothing is kicked off, so no LLM calls are made.
+
+    python benchmark_crew_pool.py [n_candidates]
+"""
+import sys
+import time
+
+from lead_score_flow.crews.lead_score_crew.lead_score_crew import LeadScoreCrew
+from lead_score_flow.utils.crew_pool import CrewPool
+
+
+def per_candidate(setup, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        setup()
+    return (time.perf_counter() - start) * 1000 / n
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    fresh = per_candidate(lambda: LeadScoreCrew().crew(), n)
+
+    pool = CrewPool(lambda: LeadScoreCrew().crew())
+    pool.template  # the template is built once per run, outside the per-candidate cost
+
+    def checkout():
+        with pool.crew():
+            pass
+
+    copied = per_candidate(lambda: pool.template.copy(), n)
+    pooled = per_candidate(checkout, n)
+
+    print(f"Per-candidate setup over {n} candidates:")
+    print(f"  LeadScoreCrew().crew(): {fresh:.2f} ms")
+    print(f"  template copy:          {copied:.2f} ms")
+    print(f"  pooled checkout:        {pooled:.2f} ms")
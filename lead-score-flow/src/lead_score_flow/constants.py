@@ -1,3 +1,6 @@
+import os
+from pathlib import Path
+
 JOB_DESCRIPTION = """
 # Junior React Developer
 
@@ -45,3 +48,19 @@ SKILLS = [
     "REST APIs",
     "CrewAI",
 ]
+
+# Limits for the concurrent LLM calls made while scoring leads
+SCORING_MAX_CONCURRENCY = int(os.getenv("LEAD_SCORE_MAX_CONCURRENCY", 8))
+SCORING_REQUESTS_PER_MINUTE = float(os.getenv("LEAD_SCORE_REQUESTS_PER_MINUTE", 60))
+SCORING_TOKENS_PER_MINUTE = float(os.getenv("LEAD_SCORE_TOKENS_PER_MINUTE", 150000))
+
+# Checkpoint of candidate scores, reused across re-runs and after interruptions
+SCORE_STORE_PATH = os.getenv(
+    "LEAD_SCORE_STORE", str(Path(__file__).parent / "lead_scores.db")
+)
+
+# Leads CSV (optionally gzipped) and how it is ingested
+LEADS_FILE = os.getenv("LEADS_FILE", str(Path(__file__).parent / "leads.csv"))
+LEADS_BATCH_SIZE = int(os.getenv("LEADS_BATCH_SIZE", 100))
+# Stream leads straight into the scoring scheduler instead of loading the whole file first
+STREAM_LEADS = os.getenv("LEADS_STREAMING", "true").lower() in ("1", "true", "yes")
@@ -1,21 +1,37 @@
 #!/usr/bin/env python
 import asyncio
-from typing import List
+from typing import AsyncIterator, List, Set
 
 from crewai.flow.flow import Flow, listen, or_, router, start
 from pydantic import BaseModel
 
-from lead_score_flow.constants import JOB_DESCRIPTION
+from lead_score_flow.constants import (
+    JOB_DESCRIPTION,
+    LEADS_BATCH_SIZE,
+    LEADS_FILE,
+    SCORE_STORE_PATH,
+    SCORING_MAX_CONCURRENCY,
+    SCORING_REQUESTS_PER_MINUTE,
+    SCORING_TOKENS_PER_MINUTE,
+    STREAM_LEADS,
+)
 from lead_score_flow.crews.lead_response_crew.lead_response_crew import LeadResponseCrew
 from lead_score_flow.crews.lead_score_crew.lead_score_crew import LeadScoreCrew
-from lead_score_flow.types import Candidate, CandidateScore, ScoredCandidate
-from lead_score_flow.utils.candidateUtils import combine_candidates_with_scores
+from lead_score_flow.types import Candidate, CandidateScore
+from lead_score_flow.utils.crew_pool import CrewPool
+from lead_score_flow.utils.lead_reader import iter_candidate_batches
+from lead_score_flow.utils.ranking import CandidateRanking
+from lead_score_flow.utils.scheduler import RateLimitedScheduler
+from lead_score_flow.utils.score_store import ScoreStore, score_inputs_hash
+
+# Crews are built once and copied per candidate instead of being rebuilt from YAML every time
+lead_score_crews = CrewPool(lambda: LeadScoreCrew().crew())
+lead_response_crews = CrewPool(lambda: LeadResponseCrew().crew())
 
 
 class LeadScoreState(BaseModel):
     candidates: List[Candidate] = []
     candidate_score: List[CandidateScore] = []
-    hydrated_candidates: List[ScoredCandidate] = []
     scored_leads_feedback: str = ""
 
 
@@ -24,72 +40,123 @@ class LeadScoreFlow(Flow[LeadScoreState]):
 
     @start()
     def load_leads(self):
-        import csv
-        from pathlib import Path
-
-        # Get the path to leads.csv in the same directory
-        current_dir = Path(__file__).parent
-        csv_file = current_dir / "leads.csv"
+        if STREAM_LEADS:
+            # score_leads reads the file batch by batch and starts scoring on the first one
+            print(f"Streaming leads from {LEADS_FILE}")
+            return
 
         candidates = []
-        with open(csv_file, mode="r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                # Create a Candidate object for each row
-                print("Row:", row)
-                candidate = Candidate(**row)
-                candidates.append(candidate)
+        for batch in iter_candidate_batches(LEADS_FILE, LEADS_BATCH_SIZE):
+            candidates.extend(batch)
 
         # Update the state with the loaded candidates
         self.state.candidates = candidates
+        print(f"Loaded {len(candidates)} leads from {LEADS_FILE}")
+
+    async def candidate_batches(self) -> AsyncIterator[List[Candidate]]:
+        """
+        Yield candidates in batches, reading them from disk on a worker thread when they have not
+        been loaded yet so scoring can run while the rest of the file is read.
+
+        Streamed batches are not kept in the state, and the next one is only read once the caller
+        asks for it, so a caller that waits for room before pulling bounds the read-ahead to one
+        batch. A rerun with feedback streams the file again.
+        """
+        if self.state.candidates:
+            for i in range(0, len(self.state.candidates), LEADS_BATCH_SIZE):
+                yield self.state.candidates[i : i + LEADS_BATCH_SIZE]
+            return
+
+        batches = iter_candidate_batches(LEADS_FILE, LEADS_BATCH_SIZE)
+        while True:
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            yield batch
 
     @listen(or_(load_leads, "scored_leads_feedback"))
     async def score_leads(self):
         print("Scoring leads")
-        tasks = []
+        feedback = self.state.scored_leads_feedback
+        store = ScoreStore(SCORE_STORE_PATH)
+        scheduler = RateLimitedScheduler(
+            max_concurrency=SCORING_MAX_CONCURRENCY,
+            requests_per_minute=SCORING_REQUESTS_PER_MINUTE,
+            tokens_per_minute=SCORING_TOKENS_PER_MINUTE,
+            label="Scoring leads",
+        )
 
-        async def score_single_candidate(candidate: Candidate):
-            result = await (
-                LeadScoreCrew()
-                .crew()
-                .kickoff_async(
+        async def score_single_candidate(candidate: Candidate, inputs_hash: str):
+            with lead_score_crews.crew() as crew:
+                result = await crew.kickoff_async(
                     inputs={
                         "candidate_id": candidate.id,
                         "name": candidate.name,
                         "bio": candidate.bio,
                         "job_description": JOB_DESCRIPTION,
-                        "additional_instructions": self.state.scored_leads_feedback,
+                        "additional_instructions": feedback,
                     }
                 )
-            )
 
+            # Checkpoint right away so an interrupted run resumes from here
+            store.put(candidate.id, inputs_hash, result.pydantic)
             self.state.candidate_score.append(result.pydantic)
-
-        for candidate in self.state.candidates:
-            print("Scoring candidate:", candidate.name)
-            task = asyncio.create_task(score_single_candidate(candidate))
-            tasks.append(task)
-
-        candidate_scores = await asyncio.gather(*tasks)
-        print("Finished scoring leads: ", len(candidate_scores))
+            self.ranking.add_score(result.pydantic)
+
+        def estimate_tokens(candidate: Candidate) -> float:
+            # Rough prompt size at ~4 characters per token plus room for the answer
+            prompt = candidate.bio + candidate.skills + JOB_DESCRIPTION + feedback
+            return len(prompt) / 4 + 500
+
+        # Reuse stored scores and only send candidates whose inputs changed to the LLM
+        self.state.candidate_score = []
+        # The top 3 is kept up to date as scores land instead of sorting everything at the end
+        self.ranking = CandidateRanking(k=3)
+        pending: Set[asyncio.Task] = set()
+        cached = scored = 0
+
+        async def wait_for_room():
+            # Backpressure: candidates are only read and submitted as fast as they get scored
+            while len(pending) >= SCORING_MAX_CONCURRENCY:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                for task in done:
+                    # A failed candidate stops the run, like gather does
+                    task.result()
+
+        try:
+            async for batch in self.candidate_batches():
+                for candidate in batch:
+                    self.ranking.add_candidate(candidate)
+                    inputs_hash = score_inputs_hash(candidate, JOB_DESCRIPTION, feedback)
+                    score = store.get(candidate.id, inputs_hash)
+                    if score:
+                        self.state.candidate_score.append(score)
+                        self.ranking.add_score(score)
+                        cached += 1
+                        continue
+                    await wait_for_room()
+                    pending.add(
+                        scheduler.submit(
+                            lambda c=candidate, h=inputs_hash: score_single_candidate(c, h),
+                            estimate_tokens(candidate),
+                        )
+                    )
+                    scored += 1
+            print(f"Reusing {cached} stored scores, scoring {scored} leads")
+            await scheduler.join(list(pending))
+        finally:
+            # A failed candidate stops the run, not its siblings, which still write to the store
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            store.close()
+        print(f"Finished scoring leads: {cached} from the store, {scored} scored")
 
     @router(score_leads)
     def human_in_the_loop(self):
         print("Finding the top 3 candidates for human to review")
-
-        # Combine candidates with their scores using the helper function
-        self.state.hydrated_candidates = combine_candidates_with_scores(
-            self.state.candidates, self.state.candidate_score
-        )
-
-        # Sort the scored candidates by their score in descending order
-        sorted_candidates = sorted(
-            self.state.hydrated_candidates, key=lambda c: c.score, reverse=True
-        )
-        self.state.hydrated_candidates = sorted_candidates
-
-        # Select the top 3 candidates
-        top_candidates = sorted_candidates[:3]
+        top_candidates = self.ranking.top()
 
         print("Here are the top 3 candidates:")
         for candidate in top_candidates:
@@ -97,13 +164,27 @@ class LeadScoreFlow(Flow[LeadScoreState]):
                 f"ID: {candidate.id}, Name: {candidate.name}, Score: {candidate.score}, Reason: {candidate.reason}"
             )
 
-        # Present options to the user
-        print("\nPlease choose an option:")
-        print("1. Quit")
-        print("2. Redo lead scoring with additional feedback")
-        print("3. Proceed with writing emails to all leads")
-
-        choice = input("Enter the number of your choice: ")
+        page = 0
+        while True:
+            # Present options to the user
+            print("\nPlease choose an option:")
+            print("1. Quit")
+            print("2. Redo lead scoring with additional feedback")
+            print("3. Proceed with writing emails to all leads")
+            print("4. Show the next page of the full ranking")
+
+            choice = input("Enter the number of your choice: ")
+            if choice != "4":
+                break
+
+            ranked = self.ranking.page(page, size=10)
+            if not ranked:
+                print("\nNo more candidates.")
+            for position, candidate in enumerate(ranked, start=page * 10 + 1):
+                print(
+                    f"{position}. ID: {candidate.id}, Name: {candidate.name}, Score: {candidate.score}"
+                )
+            page += 1
 
         if choice == "1":
             print("Exiting the program.")
@@ -130,9 +211,7 @@ class LeadScoreFlow(Flow[LeadScoreState]):
         print("Writing and saving emails for all leads.")
 
         # Determine the top 3 candidates to proceed with
-        top_candidate_ids = {
-            candidate.id for candidate in self.state.hydrated_candidates[:3]
-        }
+        top_candidate_ids = set(self.ranking.top_ids())
 
         tasks = []
 
@@ -146,10 +225,8 @@ class LeadScoreFlow(Flow[LeadScoreState]):
             proceed_with_candidate = candidate.id in top_candidate_ids
 
             # Kick off the LeadResponseCrew for each candidate
-            result = await (
-                LeadResponseCrew()
-                .crew()
-                .kickoff_async(
+            with lead_response_crews.crew() as crew:
+                result = await crew.kickoff_async(
                     inputs={
                         "candidate_id": candidate.id,
                         "name": candidate.name,
@@ -157,7 +234,6 @@ class LeadScoreFlow(Flow[LeadScoreState]):
                         "proceed_with_candidate": proceed_with_candidate,
                     }
                 )
-            )
 
             # Sanitize the candidate's name to create a valid filename
             safe_name = re.sub(r"[^a-zA-Z0-9_\- ]", "", candidate.name)
@@ -173,7 +249,7 @@ class LeadScoreFlow(Flow[LeadScoreState]):
             return f"Email saved for {candidate.name} as {filename}"
 
         # Create tasks for all candidates
-        for candidate in self.state.hydrated_candidates:
+        for candidate in self.ranking.scored_candidates():
             task = asyncio.create_task(write_email(candidate))
             tasks.append(task)
 
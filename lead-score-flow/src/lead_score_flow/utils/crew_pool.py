@@ -0,0 +1,65 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from crewai import Crew
+
+
+class CrewPool:
+    """
+    Hands out ready-to-run crews built from a single template.
+
+    The template is created once with `crew_factory`, which is where the YAML configs get parsed and
+    the agents and their LLM clients get built. Every checkout gets its own copy of the crew, so
+    concurrent kickoffs never share agents or tasks, and copies are returned to the pool after use
+    so later candidates reuse them instead of copying again. A returned crew has the task outputs,
+    counters and usage metrics of its last kickoff cleared, so the next candidate starts clean.
+    """
+
+    def __init__(self, crew_factory: Callable[[], Crew]):
+        self._crew_factory = crew_factory
+        self._template: Optional[Crew] = None
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def template(self) -> Crew:
+        with self._lock:
+            if self._template is None:
+                self._template = self._crew_factory()
+            return self._template
+
+    def acquire(self) -> Crew:
+        try:
+            return self._idle.pop()
+        except IndexError:
+            return self.template.copy()
+
+    def release(self, crew: Crew):
+        self.reset(crew)
+        self._idle.append(crew)
+
+    @staticmethod
+    def reset(crew: Crew):
+        """
+        Clear the state a kickoff leaves on the crew and its tasks.
+        """
+        for task in crew.tasks:
+            task.output = None
+            task.used_tools = 0
+            task.tools_errors = 0
+            task.delegations = 0
+            task.processed_by_agents = set()
+        crew.usage_metrics = None
+
+    @contextmanager
+    def crew(self) -> Iterator[Crew]:
+        """
+        Check out a crew for the duration of the `with` block.
+        """
+        crew = self.acquire()
+        try:
+            yield crew
+        finally:
+            self.release(crew)
@@ -0,0 +1,48 @@
+import csv
+import gzip
+from pathlib import Path
+from typing import Iterator, List, TextIO, Union
+
+from pydantic import ValidationError
+
+from lead_score_flow.types import Candidate
+
+
+def open_leads_file(path: Union[str, Path]) -> TextIO:
+    """
+    Open a leads CSV for reading, transparently decompressing `.gz` files.
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, mode="rt", newline="", encoding="utf-8")
+    return open(path, mode="r", newline="", encoding="utf-8")
+
+
+def iter_candidate_batches(
+    path: Union[str, Path], batch_size: int = 100
+) -> Iterator[List[Candidate]]:
+    """
+    Stream `Candidate` objects from a leads CSV in batches of `batch_size`.
+
+    The reader itself only holds the batch being filled; how many batches stay in memory is up to
+    the caller. Rows that fail validation are reported and skipped.
+    """
+    skipped = 0
+    with open_leads_file(path) as file:
+        reader = csv.DictReader(file)
+        batch = []
+        for row in reader:
+            try:
+                batch.append(Candidate(**row))
+            except (TypeError, ValidationError) as e:
+                skipped += 1
+                reason = str(e).splitlines()[0]
+                print(f"Skipping invalid lead on line {reader.line_num}: {reason}")
+                continue
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    if skipped:
+        print(f"Skipped {skipped} invalid leads")
@@ -0,0 +1,76 @@
+import heapq
+from typing import Dict, Iterator, List, Tuple
+
+from lead_score_flow.types import Candidate, CandidateScore, ScoredCandidate
+
+
+class CandidateRanking:
+    """
+    Ranks candidates by score while the scores stream in.
+
+    A min-heap of size `k` keeps the current top candidates up to date in O(log k) per score, so
+    the shortlist is ready as soon as the last score lands. The full ranking is only materialized
+    page by page when it is asked for. Ties keep the order the candidates were loaded in.
+    """
+
+    def __init__(self, k: int = 3):
+        self.k = k
+        self._candidates: Dict[str, Tuple[int, Candidate]] = {}
+        self._scores: Dict[str, CandidateScore] = {}
+        self._top: List[Tuple[int, int, str]] = []
+
+    def add_candidate(self, candidate: Candidate):
+        if candidate.id not in self._candidates:
+            self._candidates[candidate.id] = (len(self._candidates), candidate)
+
+    def add_score(self, score: CandidateScore):
+        if score.id not in self._candidates or score.id in self._scores:
+            return
+        self._scores[score.id] = score
+        entry = self._key(score.id)
+        if len(self._top) < self.k:
+            heapq.heappush(self._top, entry)
+        elif entry > self._top[0]:
+            heapq.heapreplace(self._top, entry)
+
+    def _key(self, candidate_id: str) -> Tuple[int, int, str]:
+        position, _ = self._candidates[candidate_id]
+        return (self._scores[candidate_id].score, -position, candidate_id)
+
+    def _hydrate(self, candidate_id: str) -> ScoredCandidate:
+        _, candidate = self._candidates[candidate_id]
+        score = self._scores[candidate_id]
+        return ScoredCandidate(
+            **candidate.model_dump(), score=score.score, reason=score.reason
+        )
+
+    def top(self) -> List[ScoredCandidate]:
+        """
+        The best `k` candidates, highest score first.
+        """
+        return [self._hydrate(entry[2]) for entry in sorted(self._top, reverse=True)]
+
+    def top_ids(self) -> List[str]:
+        return [entry[2] for entry in sorted(self._top, reverse=True)]
+
+    def page(self, number: int, size: int = 10) -> List[ScoredCandidate]:
+        """
+        One page of the full ranking, highest score first. Page numbers start at 0.
+        """
+        if number < 0 or size <= 0:
+            return []
+        best = heapq.nlargest(
+            (number + 1) * size, (self._key(candidate_id) for candidate_id in self._scores)
+        )
+        return [self._hydrate(entry[2]) for entry in best[number * size :]]
+
+    def scored_candidates(self) -> Iterator[ScoredCandidate]:
+        """
+        Every scored candidate in load order, hydrated lazily.
+        """
+        for candidate_id in self._candidates:
+            if candidate_id in self._scores:
+                yield self._hydrate(candidate_id)
+
+    def __len__(self) -> int:
+        return len(self._scores)
@@ -0,0 +1,161 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Detect provider rate limit errors (HTTP 429) without depending on a specific client library.
+    """
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "rate limit" in message or "429" in message
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`, holding at most one minute of budget.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.tokens = rate_per_minute
+        self.updated_at = time.monotonic()
+
+    def _refill(self, scale: float):
+        now = time.monotonic()
+        capacity = self.rate_per_minute * scale
+        self.tokens = min(
+            capacity,
+            self.tokens + (now - self.updated_at) * capacity / 60,
+        )
+        self.updated_at = now
+
+    async def acquire(self, amount: float, scale: float = 1.0):
+        while True:
+            self._refill(scale)
+            # A single request larger than the bucket waits for a full bucket instead of forever
+            needed = min(amount, self.rate_per_minute * scale)
+            if self.tokens >= needed:
+                self.tokens -= needed
+                return
+            await asyncio.sleep((needed - self.tokens) * 60 / (self.rate_per_minute * scale))
+
+
+class RateLimitedScheduler:
+    """
+    Runs async jobs under a concurrency cap and requests/tokens per minute budgets.
+
+    When a job fails with a rate limit error the scheduler halves its effective rate, waits with
+    jittered backoff and retries the job. Every successful job recovers a small part of the rate,
+    so throughput climbs back to the configured limits once the provider stops pushing back.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        label: str = "Jobs",
+        progress_every: int = 10,
+    ):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.label = label
+        self.progress_every = progress_every
+        self.rate_scale = 1.0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.started_at = time.monotonic()
+
+    async def _acquire_budget(self, cost: float):
+        if self.requests:
+            await self.requests.acquire(1, self.rate_scale)
+        if self.tokens and cost:
+            await self.tokens.acquire(cost, self.rate_scale)
+
+    async def run(self, job: Callable[[], Awaitable[Any]], cost: float = 0) -> Any:
+        """
+        Run `job` once budget is available, retrying it after rate limit errors.
+        `cost` is the estimated number of tokens the job will consume.
+        """
+        async with self.semaphore:
+            attempt = 0
+            while True:
+                await self._acquire_budget(cost)
+                self.in_flight += 1
+                try:
+                    result = await job()
+                except Exception as error:
+                    if not is_rate_limit_error(error) or attempt >= self.max_retries:
+                        self.failed += 1
+                        self._report(force=True)
+                        raise
+                    self.rate_limited += 1
+                    self.rate_scale = max(0.05, self.rate_scale / 2)
+                    delay = min(60, 2**attempt) * random.uniform(0.5, 1.5)
+                    print(
+                        f"{self.label}: rate limited, retrying in {delay:.1f}s "
+                        f"at {self.rate_scale:.0%} of the configured rate"
+                    )
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+                finally:
+                    self.in_flight -= 1
+                self.rate_scale = min(1.0, self.rate_scale + 0.05)
+                self.completed += 1
+                self._report()
+                return result
+
+    def submit(self, job: Callable[[], Awaitable[Any]], cost: float = 0) -> "asyncio.Task":
+        """
+        Schedule `job` and return its task without waiting for it.
+        """
+        self.submitted += 1
+        return asyncio.create_task(self.run(job, cost))
+
+    async def map(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        cost: Optional[Callable[[Any], float]] = None,
+    ) -> List[Any]:
+        """
+        Run `fn` over `items` through the scheduler and return the results in input order.
+        """
+        tasks = [
+            self.submit(lambda item=item: fn(item), cost(item) if cost else 0)
+            for item in items
+        ]
+        return await self.join(tasks)
+
+    async def join(self, tasks: List["asyncio.Task"]) -> List[Any]:
+        """
+        Wait for submitted tasks and return their results in submission order.
+        """
+        results = await asyncio.gather(*tasks)
+        self._report(force=True)
+        return results
+
+    def _report(self, force: bool = False):
+        done = self.completed + self.failed
+        if not force and done % self.progress_every:
+            return
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        print(
+            f"{self.label}: {done}/{self.submitted} done, {self.failed} failed, "
+            f"{self.in_flight} in flight, {self.rate_limited} rate limited, "
+            f"{self.completed * 60 / elapsed:.1f}/min"
+        )
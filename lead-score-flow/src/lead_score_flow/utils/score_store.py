@@ -0,0 +1,64 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from lead_score_flow.types import Candidate, CandidateScore
+
+
+def score_inputs_hash(candidate: Candidate, job_description: str, feedback: str) -> str:
+    """
+    Hash everything that can change a candidate's score.
+    """
+    inputs = {
+        "bio": candidate.bio,
+        "skills": candidate.skills,
+        "job_description": job_description,
+        "feedback": feedback,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ScoreStore:
+    """
+    SQLite checkpoint of candidate scores keyed by candidate id and a hash of the scoring inputs.
+
+    Every score is committed as soon as it lands, so an interrupted run keeps the work it finished,
+    and a re-run only has to score the candidates whose inputs changed.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidate_scores (
+                candidate_id TEXT NOT NULL,
+                inputs_hash TEXT NOT NULL,
+                score TEXT NOT NULL,
+                scored_at REAL NOT NULL,
+                PRIMARY KEY (candidate_id, inputs_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, candidate_id: str, inputs_hash: str) -> Optional[CandidateScore]:
+        row = self._conn.execute(
+            "SELECT score FROM candidate_scores WHERE candidate_id = ? AND inputs_hash = ?",
+            (candidate_id, inputs_hash),
+        ).fetchone()
+        return CandidateScore.model_validate_json(row[0]) if row else None
+
+    def put(self, candidate_id: str, inputs_hash: str, score: CandidateScore):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO candidate_scores VALUES (?, ?, ?, ?)",
+            (candidate_id, inputs_hash, score.model_dump_json(), time.time()),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,47 @@
+import pytest
+
+crewai = pytest.importorskip("crewai")
+
+from crewai import Agent, Crew, Task  # noqa: E402
+
+from lead_score_flow.utils.crew_pool import CrewPool  # noqa: E402
+
+
+def make_crew() -> Crew:
+    agent = Agent(role="Scorer", goal="Score the candidate", backstory="You score candidates.")
+    task = Task(description="Score {name}", expected_output="A score", agent=agent)
+    return Crew(agents=[agent], tasks=[task])
+
+
+@pytest.fixture
+def no_llm(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(
+        Agent, "execute_task", lambda self, task, *args, **kwargs: f"scored: {task.description}"
+    )
+
+
+def test_reused_crew_has_no_leftover_task_output(no_llm):
+    pool = CrewPool(make_crew)
+
+    with pool.crew() as crew:
+        result = crew.kickoff(inputs={"name": "Ada"})
+        assert result.raw == "scored: Score Ada"
+        assert crew.tasks[0].output is not None
+        first = crew
+
+    with pool.crew() as crew:
+        assert crew is first
+        assert all(task.output is None for task in crew.tasks)
+        assert all(not task.processed_by_agents for task in crew.tasks)
+        assert crew.usage_metrics is None
+        result = crew.kickoff(inputs={"name": "Grace"})
+        assert result.raw == "scored: Score Grace"
+
+
+def test_concurrent_checkouts_get_separate_crews(no_llm):
+    pool = CrewPool(make_crew)
+
+    with pool.crew() as first, pool.crew() as second:
+        assert first is not second
+        assert first.tasks[0] is not second.tasks[0]
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
+import asyncio
 import csv
 import os
-from typing import List
+import time
+from typing import Dict, List
 
 from crewai.flow.flow import Flow, listen, start
 from pydantic import BaseModel
@@ -10,13 +12,22 @@ from meeting_assistant_flow.crews.meeting_assistant_crew.meeting_assistant_crew
     MeetingAssistantCrew,
 )
 from meeting_assistant_flow.types import MeetingTask
-from meeting_assistant_flow.utils.slack_helper import send_message_to_channel
-from meeting_assistant_flow.utils.trello_helper import save_tasks_to_trello
+from meeting_assistant_flow.utils.slack_helper import get_slack_sender
+from meeting_assistant_flow.utils.timing import timed_listener
+from meeting_assistant_flow.utils.trello_helper import save_tasks_to_trello_async
+from meeting_assistant_flow.utils.transcript import Segment, iter_segments, merge_tasks
 
 
 class MeetingState(BaseModel):
-    transcript: str = "Meeting transcript goes here"
+    # The transcript is streamed from disk in segments instead of being loaded whole
+    transcript_path: str = "meeting_notes.txt"
+    segment_chars: int = int(os.environ.get("MEETING_SEGMENT_CHARS", 12000))
+    segment_minutes: int = int(os.environ.get("MEETING_SEGMENT_MINUTES", 10))
+    max_concurrent_segments: int = int(os.environ.get("MEETING_MAX_CONCURRENT_SEGMENTS", 4))
     tasks: List[MeetingTask] = []
+    # Wall time of each listener that runs once the tasks are generated
+    listener_timings: Dict[str, float] = {}
+    tasks_generated_at: float = 0.0
 
 
 class MeetingFlow(Flow[MeetingState]):
@@ -27,31 +38,63 @@ class MeetingFlow(Flow[MeetingState]):
         print("Loading Meeting Notes")
         print("Current working directory:", os.getcwd())
 
-        with open("meeting_notes.txt", "r") as file:
-            self.state.transcript = file.read()
+        if not os.path.exists(self.state.transcript_path):
+            raise FileNotFoundError(f"No transcript at {self.state.transcript_path}")
+        size = os.path.getsize(self.state.transcript_path)
+        print(f"Transcript: {self.state.transcript_path} ({size} bytes)")
+
+    async def extract_segment_tasks(
+        self, segment: Segment, semaphore: asyncio.Semaphore
+    ) -> List[MeetingTask]:
+        try:
+            print(f"Kickoff the Meeting Assistant Crew for part {segment.number + 1}")
+            output = await MeetingAssistantCrew().crew().kickoff_async(
+                inputs={
+                    "transcript": segment.text,
+                    "segment": f"part {segment.number + 1}",
+                }
+            )
+            return output["tasks"]
+        finally:
+            semaphore.release()
 
     @listen(load_meeting_notes)
-    def generate_tasks_from_meeting_transcript(self):
-        print("Kickoff the Meeting Assistant Crew")
-        output = (
-            MeetingAssistantCrew()
-            .crew()
-            .kickoff(inputs={"transcript": self.state.transcript})
-        )
-
-        tasks = output["tasks"]
-        print("TASKS:", tasks)
+    async def generate_tasks_from_meeting_transcript(self):
+        semaphore = asyncio.Semaphore(self.state.max_concurrent_segments)
+        extractions = []
+        # Segments are read lazily, only as fast as the crews can take them
+        for segment in iter_segments(
+            self.state.transcript_path,
+            max_chars=self.state.segment_chars,
+            window_seconds=self.state.segment_minutes * 60,
+        ):
+            await semaphore.acquire()
+            extractions.append(
+                asyncio.create_task(self.extract_segment_tasks(segment, semaphore))
+            )
+
+        tasks = merge_tasks(await asyncio.gather(*extractions))
+        print(f"TASKS from {len(extractions)} parts:", tasks)
         self.state.tasks = tasks
+        self.state.tasks_generated_at = time.perf_counter()
+
+    # The listeners below are independent sinks. They are coroutines so the flow runs them
+    # concurrently, with any blocking I/O moved to worker threads.
 
     @listen(generate_tasks_from_meeting_transcript)
-    def add_tasks_to_trello(self):
+    @timed_listener
+    async def add_tasks_to_trello(self):
         print("Adding Tasks to Trello")
-        save_tasks_to_trello(self.state.tasks)
+        await save_tasks_to_trello_async(self.state.tasks)
 
     @listen(generate_tasks_from_meeting_transcript)
-    def save_new_tasks_to_csv(self):
+    @timed_listener
+    async def save_new_tasks_to_csv(self):
         print("Saving New Tasks to CSV")
-        with open("new_tasks.csv", "w", newline="") as file:
+        await asyncio.to_thread(self._write_tasks_csv, "new_tasks.csv")
+
+    def _write_tasks_csv(self, path: str):
+        with open(path, "w", newline="") as file:
             writer = csv.writer(file)
             # Write the header row
             writer.writerow(["Name", "Description"])
@@ -60,10 +103,14 @@ class MeetingFlow(Flow[MeetingState]):
                 writer.writerow([task.name, task.description])
 
     @listen(generate_tasks_from_meeting_transcript)
-    def send_slack_notification(self):
+    @timed_listener
+    async def send_slack_notification(self):
         print("Sending Slack Notification")
         message = f"{len(self.state.tasks)} New tasks have been added to Trello!"
-        send_message_to_channel(message)
+        try:
+            await get_slack_sender().send_async(message)
+        except Exception as e:
+            print(f"Slack notification failed: {e}")
 
 
 def kickoff():
@@ -72,6 +119,13 @@ def kickoff():
     """
     meeting_flow = MeetingFlow()
     meeting_flow.kickoff()
+    timings = meeting_flow.state.listener_timings
+    if timings:
+        print(
+            f"Listeners took {time.perf_counter() - meeting_flow.state.tasks_generated_at:.2f}s "
+            f"after the crew finished (slowest {max(timings.values()):.2f}s, "
+            f"sum {sum(timings.values()):.2f}s)"
+        )
 
 
 def plot():
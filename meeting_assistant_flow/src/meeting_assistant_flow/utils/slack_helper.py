@@ -1,4 +1,11 @@
+import asyncio
+import atexit
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from slack_sdk import WebClient
@@ -7,22 +14,159 @@ from slack_sdk.errors import SlackApiError
 # Load environment variables from a .env file
 load_dotenv()
 
+# Slack renders up to 4000 characters of a message's text nicely
+MAX_TEXT_LENGTH = 4000
 
-def send_message_to_channel(text: str):
-    # Get your Slack token and channel ID from the environment variables
-    SLACK_TOKEN = os.getenv("SLACK_TOKEN")
-    SLACK_CHANNEL_ID = os.getenv("SLACK_CHANNEL_ID")
-    client = WebClient(token=SLACK_TOKEN)
+_STOP = object()
 
-    try:
-        # Send a message to the channel
-        response = client.chat_postMessage(
-            channel=SLACK_CHANNEL_ID,
-            text=text,
+
+class SlackSender:
+    """
+    Long-lived Slack sender that batches messages per channel.
+
+    One `WebClient` is kept for the life of the process and a background thread posts everything
+    queued with `send()`. Messages for the same channel that arrive within `window` seconds of
+    each other are coalesced into a single post (split at `MAX_TEXT_LENGTH`), which also keeps a
+    busy channel under Slack's one message per second limit. Rate limited posts are retried after
+    the `Retry-After` delay Slack asks for. Queued messages are flushed by `close()`, which also
+    runs at interpreter exit.
+
+    Set `base_url` (or `SLACK_API_URL`) to point the sender at a local stub server in tests.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        channel: Optional[str] = None,
+        window: Optional[float] = None,
+        base_url: Optional[str] = None,
+        max_retries: int = 3,
+    ):
+        self.channel = channel or os.getenv("SLACK_CHANNEL_ID")
+        self.window = window if window is not None else float(os.getenv("SLACK_BATCH_WINDOW", 1.0))
+        self.max_retries = max_retries
+        self.client = WebClient(
+            token=token or os.getenv("SLACK_TOKEN"),
+            base_url=base_url or os.getenv("SLACK_API_URL", WebClient.BASE_URL),
         )
-        return response
-    except SlackApiError as e:
-        print(f"Error sending message: {e.response['error']}")
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="slack-sender", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def send(self, text: str, channel: Optional[str] = None) -> Future:
+        """
+        Queue a message; the returned future resolves to the Slack response of the post carrying it.
+        """
+        if self._closed:
+            raise RuntimeError("The Slack sender is closed")
+        future: Future = Future()
+        self._queue.put((channel or self.channel, text, future))
+        return future
+
+    async def send_async(self, text: str, channel: Optional[str] = None):
+        return await asyncio.wrap_future(self.send(text, channel))
+
+    def flush(self):
+        """
+        Block until every message queued so far has been posted.
+        """
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batches: Dict[str, List[Tuple[str, Future]]] = {}
+            taken = 1
+            channel, text, future = item
+            batches.setdefault(channel, []).append((text, future))
+            deadline = time.monotonic() + self.window
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is _STOP:
+                    stopping = True
+                    break
+                channel, text, future = item
+                batches.setdefault(channel, []).append((text, future))
+            for channel, messages in batches.items():
+                for chunk in self._chunks(messages):
+                    self._post(channel, chunk)
+            for _ in range(taken):
+                self._queue.task_done()
+
+    @staticmethod
+    def _chunks(messages: List[Tuple[str, Future]]) -> List[List[Tuple[str, Future]]]:
+        chunks: List[List[Tuple[str, Future]]] = []
+        size = MAX_TEXT_LENGTH
+        for text, future in messages:
+            if size + len(text) + 1 > MAX_TEXT_LENGTH:
+                chunks.append([])
+                size = 0
+            chunks[-1].append((text, future))
+            size += len(text) + 1
+        return chunks
+
+    def _post(self, channel: str, messages: List[Tuple[str, Future]]):
+        text = "\n".join(text for text, _ in messages)
+        error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.chat_postMessage(channel=channel, text=text)
+                for _, future in messages:
+                    future.set_result(response)
+                return
+            except SlackApiError as e:
+                headers = {k.lower(): v for k, v in (e.response.headers or {}).items()}
+                if e.response.status_code == 429 and attempt < self.max_retries:
+                    time.sleep(float(headers.get("retry-after", 1)))
+                    continue
+                print(f"Error sending message: {e.response['error']}")
+                error = e
+            except Exception as e:
+                print(f"Error sending message: {e}")
+                error = e
+            break
+        for _, future in messages:
+            future.set_exception(error)
+
+
+_sender: Optional[SlackSender] = None
+_sender_lock = threading.Lock()
+
+
+def get_slack_sender() -> SlackSender:
+    """
+    Return the process-wide Slack sender, starting it on first use.
+    """
+    global _sender
+    with _sender_lock:
+        if _sender is None:
+            _sender = SlackSender()
+        return _sender
+
+
+def send_message_to_channel(text: str):
+    try:
+        # Send a message to the channel and wait for the post that carries it
+        return get_slack_sender().send(text).result()
+    except SlackApiError:
+        return None
 
 
 if __name__ == "__main__":
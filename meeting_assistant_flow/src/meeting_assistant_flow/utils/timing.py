@@ -0,0 +1,20 @@
+import functools
+import time
+
+
+def timed_listener(method):
+    """
+    Time an async flow listener, recording its wall time in `state.listener_timings`.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.state.listener_timings[method.__name__] = elapsed
+            print(f"{method.__name__} finished in {elapsed:.2f}s")
+
+    return wrapper
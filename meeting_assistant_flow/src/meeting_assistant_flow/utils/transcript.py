@@ -0,0 +1,198 @@
+import re
+import string
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Iterable, Iterator, List, Optional, Set
+
+from meeting_assistant_flow.types import MeetingTask
+
+# "Alex: ...", "Alex Smith: ..." or "[00:12:34] Alex: ..."
+TURN_PATTERN = re.compile(
+    r"^\s*(?:\[?(?P<time>(?:\d{1,2}:)?\d{1,2}:\d{2})\]?\s*)?"
+    r"(?P<speaker>[A-Z][\w.'\-]*(?: [\w.'\-]+){0,2}):\s+(?P<text>.*)$",
+    re.DOTALL,
+)
+
+# Up to three capitalized words without digits, so "Creating subscriptions:" is not a speaker
+NAME_PATTERN = re.compile(r"[A-Z][A-Za-z.'\-]*(?: [A-Z][A-Za-z.'\-]*){0,2}")
+
+
+@dataclass
+class Turn:
+    speaker: str
+    text: str
+    seconds: Optional[int] = None
+
+    def render(self) -> str:
+        return f"{self.speaker}: {self.text.strip()}"
+
+
+@dataclass
+class Segment:
+    number: int
+    turns: List[Turn] = field(default_factory=list)
+    context_turns: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(turn.render() for turn in self.turns)
+
+    @property
+    def start_seconds(self) -> Optional[int]:
+        return self.turns[self.context_turns].seconds if self.turns else None
+
+
+def _seconds(timestamp: Optional[str]) -> Optional[int]:
+    if not timestamp:
+        return None
+    seconds = 0
+    for part in timestamp.split(":"):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def _is_speaker(match: re.Match, speakers: Set[str], in_list: bool) -> bool:
+    """
+    Tell a speaker prefix apart from a "Label: ..." line, such as "Pro: $49 per month".
+
+    Someone who already spoke is always a speaker. A new speaker needs a name-like prefix, text
+    that does not open with a price or number, and must not show up inside a list that a turn
+    introduced with a trailing colon.
+    """
+    speaker = match["speaker"].strip()
+    if speaker in speakers:
+        return True
+    if not NAME_PATTERN.fullmatch(speaker):
+        return False
+    if re.match(r"[$\d]", match["text"]):
+        return False
+    return not in_list
+
+
+def iter_turns(lines: Iterable[str]) -> Iterator[Turn]:
+    """
+    Group transcript lines into speaker turns. Lines without a speaker continue the current turn.
+    """
+    turn: Optional[Turn] = None
+    speakers: Set[str] = set()
+    # A line ending with a colon opens a list, the first blank line after its items closes it
+    in_list = False
+    list_items = 0
+    for line in lines:
+        match = TURN_PATTERN.match(line)
+        if match and _is_speaker(match, speakers, in_list):
+            if turn is not None:
+                yield turn
+            turn = Turn(
+                speaker=match["speaker"].strip(),
+                text=match["text"] + "\n",
+                seconds=_seconds(match["time"]),
+            )
+            speakers.add(turn.speaker)
+            in_list, list_items = match["text"].rstrip().endswith(":"), 0
+        elif turn is not None:
+            turn.text += line
+            if line.strip().endswith(":"):
+                in_list, list_items = True, 0
+            elif line.strip():
+                list_items += in_list
+            elif list_items:
+                in_list, list_items = False, 0
+        elif line.strip():
+            turn = Turn(speaker="Unknown", text=line)
+    if turn is not None:
+        yield turn
+
+
+def iter_segments(
+    path: str,
+    max_chars: int = 12000,
+    window_seconds: int = 600,
+    overlap_turns: int = 1,
+    min_chars: Optional[int] = None,
+) -> Iterator[Segment]:
+    """
+    Stream a transcript from disk as segments of whole speaker turns.
+
+    A segment ends before it would exceed `max_chars`, or, when the transcript has timestamps,
+    `window_seconds` after its first turn. The last `overlap_turns` turns of a segment are repeated
+    at the start of the next one as context, so a task discussed across the boundary is not lost.
+    A single turn longer than `max_chars` becomes a segment of its own. A last segment with less
+    than `min_chars` (a tenth of `max_chars` by default) of new turns is folded into the one
+    before it instead of costing an extra LLM call.
+    """
+    if min_chars is None:
+        min_chars = max_chars // 10
+    number = 0
+    segment = Segment(number=number)
+    size = 0
+    # Every segment is held back until the next one starts, so a short tail can still be merged
+    previous: Optional[Segment] = None
+    with open(path, "r", encoding="utf-8") as file:
+        for turn in iter_turns(file):
+            turn_size = _turn_size(turn)
+            start = segment.start_seconds if len(segment.turns) > segment.context_turns else None
+            window_full = (
+                start is not None
+                and turn.seconds is not None
+                and turn.seconds - start >= window_seconds
+            )
+            if len(segment.turns) > segment.context_turns and (
+                size + turn_size > max_chars or window_full
+            ):
+                if previous is not None:
+                    yield previous
+                previous = segment
+                number += 1
+                context = segment.turns[-overlap_turns:] if overlap_turns else []
+                segment = Segment(number=number, turns=list(context), context_turns=len(context))
+                size = sum(_turn_size(t) for t in context)
+            segment.turns.append(turn)
+            size += turn_size
+    new_turns = segment.turns[segment.context_turns :]
+    if previous is not None and new_turns and sum(map(_turn_size, new_turns)) < min_chars:
+        previous.turns.extend(new_turns)
+        new_turns = []
+    if previous is not None:
+        yield previous
+    if new_turns:
+        yield segment
+
+
+def _turn_size(turn: Turn) -> int:
+    return len(turn.text) + len(turn.speaker) + 4
+
+
+def _normalize(name: str) -> str:
+    name = name.lower().translate(str.maketrans("", "", string.punctuation))
+    return " ".join(name.split())
+
+
+def similar_task_names(a: str, b: str, threshold: float = 0.85) -> bool:
+    a, b = _normalize(a), _normalize(b)
+    if a == b:
+        return True
+    words_a, words_b = set(a.split()), set(b.split())
+    if words_a and words_b and len(words_a & words_b) / len(words_a | words_b) >= threshold:
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= threshold
+
+
+def merge_tasks(task_lists: Iterable[List[MeetingTask]], threshold: float = 0.85) -> List[MeetingTask]:
+    """
+    Merge the tasks of every segment in order, folding tasks with similar names together.
+
+    The first name seen is kept, along with the most detailed description.
+    """
+    merged: List[MeetingTask] = []
+    for tasks in task_lists:
+        for task in tasks:
+            duplicate = next(
+                (kept for kept in merged if similar_task_names(kept.name, task.name, threshold)),
+                None,
+            )
+            if duplicate is None:
+                merged.append(task.model_copy())
+            elif len(task.description) > len(duplicate.description):
+                duplicate.description = task.description
+    return merged
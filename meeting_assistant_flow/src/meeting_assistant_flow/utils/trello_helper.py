@@ -1,10 +1,16 @@
+import asyncio
+import hashlib
 import os
-from typing import List
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
 
 from meeting_assistant_flow.types import MeetingTask
+from meeting_assistant_flow.utils.http_session import PooledSession
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,60 +23,225 @@ TOKEN = os.getenv("TRELLO_TOKEN")
 BOARD_ID = os.getenv("TRELLO_BOARD_ID")
 LIST_ID = os.getenv("TRELLO_LIST_ID")
 
+TRELLO_API_URL = "https://api.trello.com/1"
+
+# Trello allows 100 requests per 10 seconds per token, keep some headroom
+TRELLO_REQUESTS_PER_WINDOW = 90
+TRELLO_WINDOW_SECONDS = 10
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
-def create_trello_card(task_title, task_description):
-    """
-    Create a new card in Trello for the given task.
 
-    :param task_title: Title of the task (will be the title of the Trello card)
-    :param task_description: Detailed description of the task (will be the body of the Trello card)
-    :return: Response object from Trello API call
+class RateLimiter:
     """
-    url = "https://api.trello.com/1/cards"
+    Sliding-window limiter: at most `max_requests` requests start in any `period` seconds.
+    """
+
+    def __init__(self, max_requests: int, period: float):
+        self.max_requests = max_requests
+        self.period = period
+        self._started: deque = deque()
 
-    query = {
-        "key": API_KEY,
-        "token": TOKEN,
-        "idList": LIST_ID,
-        "name": task_title,
-        "desc": task_description,
-    }
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            while self._started and now - self._started[0] >= self.period:
+                self._started.popleft()
+            if len(self._started) < self.max_requests:
+                self._started.append(now)
+                return
+            await asyncio.sleep(self.period - (now - self._started[0]))
 
-    response = requests.post(url, params=query)
 
-    if response.status_code == 200:
-        print(f"Task '{task_title}' successfully created in Trello.")
-    else:
-        print(f"Failed to create task '{task_title}' in Trello.")
-        print(response.text)
+class AsyncTrelloClient:
+    """
+    Creates Trello cards concurrently over one pool of keep-alive connections.
 
-    return response
+    Requests run on worker threads of a dedicated pooled session, at most `max_concurrency` at a
+    time and within Trello's per-token rate limit. Throttled and failed requests are retried with
+    jittered exponential backoff, honouring `Retry-After`.
+
+    Every card gets an idempotency key derived from its list, name and description. The keys of
+    the cards already on the list are loaded once, so a rerun skips the cards it created before,
+    and a create that timed out is only retried after checking that the card did not make it.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        token: Optional[str] = None,
+        list_id: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: int = 4,
+        backoff_factor: float = 0.5,
+        base_url: str = TRELLO_API_URL,
+    ):
+        self.api_key = api_key or API_KEY
+        self.token = token or TOKEN
+        self.list_id = list_id or LIST_ID
+        self.max_concurrency = max_concurrency or int(os.getenv("TRELLO_MAX_CONCURRENCY", 20))
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.base_url = base_url
+        # Retries are handled here, with the idempotency check in between
+        self.session = PooledSession(pool_maxsize=self.max_concurrency, retries=0)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_limiter = RateLimiter(TRELLO_REQUESTS_PER_WINDOW, TRELLO_WINDOW_SECONDS)
+        self._existing: Optional[Dict[str, str]] = None
+        self._existing_lock = asyncio.Lock()
+        self.requests_sent = 0
+
+    @staticmethod
+    def idempotency_key(list_id: str, name: str, description: str) -> str:
+        return hashlib.sha256(f"{list_id}\0{name}\0{description}".encode("utf-8")).hexdigest()
+
+    async def _send(
+        self, method: str, path: str, **params
+    ) -> Tuple[Optional[requests.Response], Optional[Exception]]:
+        await self._rate_limiter.acquire()
+        async with self._semaphore:
+            self.requests_sent += 1
+            try:
+                response = await asyncio.to_thread(
+                    self.session.request,
+                    method,
+                    f"{self.base_url}{path}",
+                    params={"key": self.api_key, "token": self.token, **params},
+                )
+                return response, None
+            except requests.RequestException as e:
+                return None, e
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None and response.headers.get("Retry-After"):
+            try:
+                return float(response.headers["Retry-After"])
+            except ValueError:
+                pass
+        return random.uniform(0, self.backoff_factor * 2**attempt)
+
+    async def _existing_cards(self, refresh: bool = False) -> Dict[str, str]:
+        """
+        Idempotency keys of the cards already on the list, mapped to their card IDs.
+        """
+        async with self._existing_lock:
+            if self._existing is not None and not refresh:
+                return self._existing
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self._backoff(attempt, response))
+                response, error = await self._send(
+                    "GET", f"/lists/{self.list_id}/cards", fields="name,desc"
+                )
+                if response is not None and response.ok:
+                    self._existing = {
+                        self.idempotency_key(self.list_id, card["name"], card["desc"]): card["id"]
+                        for card in response.json()
+                    }
+                    return self._existing
+                if response is not None and response.status_code not in RETRY_STATUSES:
+                    break
+            print(f"Could not list the existing Trello cards: {error or response.text}")
+            self._existing = self._existing or {}
+            return self._existing
+
+    async def create_card(self, name: str, description: str) -> Optional[str]:
+        """
+        Create a card unless the list already has it, returning the card ID.
+        """
+        key = self.idempotency_key(self.list_id, name, description)
+        existing = await self._existing_cards()
+        if key in existing:
+            print(f"Task '{name}' is already in Trello. Skipping...")
+            return existing[key]
+
+        response, error, ambiguous = None, None, False
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff(attempt, response))
+                if ambiguous:
+                    # The failed request may still have created the card
+                    existing = await self._existing_cards(refresh=True)
+                    if key in existing:
+                        return existing[key]
+            response, error = await self._send(
+                "POST", "/cards", idList=self.list_id, name=name, desc=description
+            )
+            if response is not None and response.ok:
+                card_id = response.json()["id"]
+                self._existing[key] = card_id
+                print(f"Task '{name}' successfully created in Trello.")
+                return card_id
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                break
+            ambiguous = response is None or response.status_code >= 500
+
+        print(f"Failed to create task '{name}' in Trello.")
+        print(error or response.text)
+        return None
+
+    async def create_cards(self, tasks: List[MeetingTask]) -> List[Optional[str]]:
+        """
+        Create a card per task concurrently, returning the card IDs in task order.
+        """
+        started = time.perf_counter()
+        requests_before = self.requests_sent
+        # Identical tasks in one batch share a single create
+        creates: Dict[str, asyncio.Task] = {}
+        pending = []
+        for task in tasks:
+            if not (task.name and task.description):
+                print("Task is missing a title or description. Skipping...")
+                pending.append(None)
+                continue
+            key = self.idempotency_key(self.list_id, task.name, task.description)
+            if key not in creates:
+                creates[key] = asyncio.ensure_future(self.create_card(task.name, task.description))
+            pending.append(creates[key])
+
+        await asyncio.gather(*creates.values())
+        card_ids = [create.result() if create else None for create in pending]
+        print(
+            f"Pushed {len(creates)} tasks to Trello in {time.perf_counter() - started:.2f}s "
+            f"over {self.requests_sent - requests_before} requests"
+        )
+        return card_ids
+
+    def close(self):
+        self.session.close()
+
+
+async def save_tasks_to_trello_async(tasks: List[MeetingTask]) -> List[Optional[str]]:
+    """
+    Save a list of tasks to Trello concurrently, skipping the ones already on the list.
+    """
+    client = AsyncTrelloClient()
+    try:
+        return await client.create_cards(tasks)
+    finally:
+        client.close()
 
 
 def save_tasks_to_trello(tasks: List[MeetingTask]):
     """
-    Save a list of tasks to Trello. Each task is a dictionary with 'title' and 'body'.
+    Save a list of tasks to Trello. Each task has a `name` and a `description`.
 
-    :param tasks: List of tasks, where each task is a dict with 'title' and 'body'
+    :param tasks: List of tasks to turn into Trello cards
     """
-    for task in tasks:
-        if task.name and task.description:
-            create_trello_card(task.name, task.description)
-        else:
-            print("Task is missing a title or description. Skipping...")
+    return asyncio.run(save_tasks_to_trello_async(tasks))
 
 
 # Example usage
 if __name__ == "__main__":
     tasks = [
-        {
-            "title": "Add Token Count Progress Indicator to Website",
-            "body": "I received a suggestion from a colleague to enhance the token count exceeded feature on our website...",
-        },
-        {
-            "title": "Improve Mobile Responsiveness for Dashboard",
-            "body": "We need to improve the mobile layout of the dashboard for better usability. The sidebar should collapse automatically...",
-        },
+        MeetingTask(
+            name="Add Token Count Progress Indicator to Website",
+            description="I received a suggestion from a colleague to enhance the token count exceeded feature on our website...",
+        ),
+        MeetingTask(
+            name="Improve Mobile Responsiveness for Dashboard",
+            description="We need to improve the mobile layout of the dashboard for better usability. The sidebar should collapse automatically...",
+        ),
     ]
 
     save_tasks_to_trello(tasks)
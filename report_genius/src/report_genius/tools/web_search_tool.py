@@ -1,12 +1,13 @@
 import os
 import json
-import requests
 from typing import List, Optional, Any
 
 from crewai.tools import BaseTool
 from langchain_community.utilities import GoogleSerperAPIWrapper
 from pydantic import Field, ConfigDict
 
+from .http_session import get_session
+
 
 class WebSearchTool(BaseTool):
     """Tool for performing web searches using either Serper API or SerpAPI.
@@ -126,7 +127,7 @@ class WebSearchTool(BaseTool):
             }
             
             # 发送请求
-            response = requests.get(url, params=params)
+            response = get_session().get(url, params=params)
             
             # 检查响应状态
             if response.status_code == 200:
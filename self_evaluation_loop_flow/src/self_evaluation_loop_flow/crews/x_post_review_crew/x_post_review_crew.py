@@ -3,7 +3,6 @@ from typing import Optional
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from pydantic import BaseModel
-from self_evaluation_loop_flow.tools.CharacterCounterTool import CharacterCounterTool
 
 
 class XPostVerification(BaseModel):
@@ -22,7 +21,6 @@ class XPostReviewCrew:
     def x_post_verifier(self) -> Agent:
         return Agent(
             config=self.agents_config["x_post_verifier"],
-            tools=[CharacterCounterTool()],
         )
 
     @task
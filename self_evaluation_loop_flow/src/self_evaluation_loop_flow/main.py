@@ -1,4 +1,6 @@
-from typing import Optional
+import asyncio
+import os
+from typing import List, Optional, Tuple
 
 from crewai.flow.flow import Flow, listen, router, start
 from pydantic import BaseModel
@@ -9,6 +11,7 @@ from self_evaluation_loop_flow.crews.shakespeare_crew.shakespeare_crew import (
 from self_evaluation_loop_flow.crews.x_post_review_crew.x_post_review_crew import (
     XPostReviewCrew,
 )
+from self_evaluation_loop_flow.x_post_rules import check_x_post
 
 
 class ShakespeareXPostFlowState(BaseModel):
@@ -16,45 +19,90 @@ class ShakespeareXPostFlowState(BaseModel):
     feedback: Optional[str] = None
     valid: bool = False
     retry_count: int = 0
+    # Drafts written and reviewed concurrently on every attempt, 1 gives the plain serial loop
+    drafts_per_attempt: int = int(os.environ.get("X_POST_DRAFTS", 1))
+    # Drafts rejected by the local rules, without a reviewer call
+    rejected_by_rules: int = 0
 
 
 class ShakespeareXPostFlow(Flow[ShakespeareXPostFlowState]):
 
+    async def review_x_post(self, x_post: str) -> Tuple[bool, Optional[str]]:
+        # Length, emojis and commentary are checked locally, the crew only judges the writing
+        problems = check_x_post(x_post)
+        if problems:
+            self.state.rejected_by_rules += 1
+            return False, " ".join(problems)
+
+        result = await XPostReviewCrew().crew().kickoff_async(inputs={"x_post": x_post})
+        return result["valid"], result["feedback"]
+
+    async def write_and_review_x_post(self, topic: str) -> Tuple[str, bool, Optional[str]]:
+        try:
+            result = await ShakespeareanXPostCrew().crew().kickoff_async(
+                inputs={"topic": topic, "feedback": self.state.feedback}
+            )
+            print("X post generated", result.raw)
+            valid, feedback = await self.review_x_post(result.raw)
+            return result.raw, valid, feedback
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # A failed call says nothing about the post, so it is not fed back as a rejection
+            print(f"The draft could not be written or reviewed: {e}")
+            return "", False, None
+
     @start("retry")
-    def generate_shakespeare_x_post(self):
-        print("Generating Shakespearean X post")
+    async def generate_shakespeare_x_post(self):
+        drafts_count = max(1, self.state.drafts_per_attempt)
+        print(f"Generating {drafts_count} Shakespearean X posts")
         topic = "Flying cars"
-        result = (
-            ShakespeareanXPostCrew()
-            .crew()
-            .kickoff(inputs={"topic": topic, "feedback": self.state.feedback})
-        )
 
-        print("X post generated", result.raw)
-        self.state.x_post = result.raw
+        # Every draft is reviewed as soon as it is written; the first valid one wins
+        drafts = [
+            asyncio.create_task(self.write_and_review_x_post(topic))
+            for _ in range(drafts_count)
+        ]
+        rejections: List[str] = []
+        try:
+            for next_draft in asyncio.as_completed(drafts):
+                x_post, valid, feedback = await next_draft
+                if x_post:
+                    self.state.x_post = x_post
+                if valid:
+                    self.state.valid = True
+                    self.state.feedback = feedback
+                    break
+                if feedback and feedback not in rejections:
+                    rejections.append(feedback)
+        finally:
+            # Crews that already run in a worker thread finish there, their results are ignored
+            for draft in drafts:
+                draft.cancel()
+
+        if not self.state.valid:
+            # The next attempt gets the feedback of every rejected draft
+            self.state.feedback = "\n".join(f"- {feedback}" for feedback in rejections)
+        self.state.retry_count += 1
 
     @router(generate_shakespeare_x_post)
     def evaluate_x_post(self):
-        if self.state.retry_count > 3:
-            return "max_retry_exceeded"
-
-        result = XPostReviewCrew().crew().kickoff(inputs={"x_post": self.state.x_post})
-        self.state.valid = result["valid"]
-        self.state.feedback = result["feedback"]
-
         print("valid", self.state.valid)
         print("feedback", self.state.feedback)
-        self.state.retry_count += 1
 
         if self.state.valid:
             return "complete"
 
+        if self.state.retry_count > 3:
+            return "max_retry_exceeded"
+
         return "retry"
 
     @listen("complete")
     def save_result(self):
         print("X post is valid")
         print("X post:", self.state.x_post)
+        print("Drafts rejected without a reviewer call:", self.state.rejected_by_rules)
 
         # Save the valid X post to a file
         with open("x_post.txt", "w") as file:
@@ -63,6 +111,7 @@ class ShakespeareXPostFlow(Flow[ShakespeareXPostFlowState]):
     @listen("max_retry_exceeded")
     def max_retry_exceeded_exit(self):
         print("Max retry count exceeded")
+        print("Drafts rejected without a reviewer call:", self.state.rejected_by_rules)
         print("X post:", self.state.x_post)
         print("Feedback:", self.state.feedback)
 
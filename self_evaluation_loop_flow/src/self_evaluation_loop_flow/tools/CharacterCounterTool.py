@@ -4,6 +4,10 @@ from crewai_tools import BaseTool
 from pydantic import BaseModel, Field
 
 
+def count_characters(text: str) -> int:
+    return len(text)
+
+
 class CharacterCounterInput(BaseModel):
     """Input schema for CharacterCounterTool."""
 
@@ -16,5 +20,5 @@ class CharacterCounterTool(BaseTool):
     args_schema: Type[BaseModel] = CharacterCounterInput
 
     def _run(self, text: str) -> str:
-        character_count = len(text)
+        character_count = count_characters(text)
         return f"The input string has {character_count} characters."
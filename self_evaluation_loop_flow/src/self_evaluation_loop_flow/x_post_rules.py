@@ -0,0 +1,89 @@
+import os
+import re
+from typing import List
+
+from self_evaluation_loop_flow.tools.CharacterCounterTool import count_characters
+
+MIN_LENGTH = 200
+MAX_LENGTH = 280
+
+# Phrases that only show up when the model wraps the post in commentary
+BANNED_TOKENS = [
+    "Here is",
+    "Here's",
+    "X post:",
+    "Tweet:",
+    "Post:",
+    "Character count",
+    "characters)",
+]
+# The ones that introduce the post are only banned at the start of a line, so "There is" or
+# "signpost:" inside the post do not trip them
+LEADING_TOKENS = {"Here is", "Here's", "X post:", "Tweet:", "Post:"}
+
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F000-\U0001FAFF"  # pictographs, emoticons, transport, flags and symbols
+    "\U00002600-\U000027BF"  # miscellaneous symbols and dingbats
+    "\U00002B00-\U00002BFF"  # arrows and stars
+    "\U0000FE0F"  # emoji presentation selector
+    "\U0000200D"  # zero width joiner used in emoji sequences
+    "]"
+)
+
+
+def banned_tokens() -> List[str]:
+    """
+    The default banned tokens plus any listed in the comma separated `X_POST_BANNED_TOKENS`.
+    """
+    extra = os.environ.get("X_POST_BANNED_TOKENS", "")
+    return BANNED_TOKENS + [token.strip() for token in extra.split(",") if token.strip()]
+
+
+def token_pattern(token: str) -> "re.Pattern[str]":
+    """
+    Match a banned token as whole words in any case, anchored to the start of a line if it leads.
+    """
+    pattern = r"\s+".join(re.escape(word) for word in token.split())
+    # Models write both straight and curly apostrophes
+    pattern = pattern.replace("'", "['\u2019]")
+    if re.match(r"\w", token):
+        pattern = r"\b" + pattern
+    if re.search(r"\w$", token):
+        pattern += r"\b"
+    if token in LEADING_TOKENS:
+        pattern = r"^\s*" + pattern
+    return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+
+
+def check_x_post(x_post: str) -> List[str]:
+    """
+    Check the mechanical rules of an X post, returning feedback for every rule it breaks.
+
+    An empty list means the post can go to the reviewer for the subjective checks.
+    """
+    problems = []
+    length = count_characters(x_post)
+    if length > MAX_LENGTH:
+        problems.append(
+            f"The post has {length} characters, cut at least {length - MAX_LENGTH} to get to "
+            f"{MAX_LENGTH} or fewer."
+        )
+    elif length < MIN_LENGTH:
+        problems.append(
+            f"The post has {length} characters, add at least {MIN_LENGTH - length} to reach "
+            f"{MIN_LENGTH} or more."
+        )
+
+    emojis = sorted(set(EMOJI_PATTERN.findall(x_post)) - {"\U0000FE0F", "\U0000200D"})
+    if emojis:
+        problems.append(f"Remove the emojis {' '.join(emojis)}, emojis are not allowed.")
+
+    found = [token for token in banned_tokens() if token_pattern(token).search(x_post)]
+    if found:
+        problems.append(
+            "Return only the post itself, without commentary. Remove: "
+            + ", ".join(f'"{token}"' for token in found)
+            + "."
+        )
+    return problems
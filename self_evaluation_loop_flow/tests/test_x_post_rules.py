@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("crewai_tools")
+
+from self_evaluation_loop_flow.x_post_rules import (  # noqa: E402
+    MAX_LENGTH,
+    MIN_LENGTH,
+    check_x_post,
+)
+
+# 245 characters of plain prose, inside the length limits
+BODY = "Lo, the carriage doth take wing above the market square, " * 4 + "and mortals gape."
+
+
+def commentary_problems(x_post):
+    return [problem for problem in check_x_post(x_post) if "without commentary" in problem]
+
+
+def test_plain_post_passes():
+    assert MIN_LENGTH <= len(BODY) <= MAX_LENGTH
+    assert check_x_post(BODY) == []
+
+
+@pytest.mark.parametrize(
+    "x_post",
+    [
+        "There is " + BODY,
+        "Where is " + BODY,
+        "Lo, the signpost: " + BODY,
+        BODY[:-20] + " so post: it soars",
+        "Thereafter, " + BODY,
+    ],
+)
+def test_banned_tokens_inside_words_or_sentences_are_allowed(x_post):
+    assert commentary_problems(x_post) == []
+
+
+@pytest.mark.parametrize(
+    "x_post, token",
+    [
+        ("Here is " + BODY, "Here is"),
+        ("here's " + BODY, "Here's"),
+        ("Here’s " + BODY, "Here's"),
+        ("  Tweet: " + BODY, "Tweet:"),
+        ("A draft for you\nX post: " + BODY, "X post:"),
+        ("Post: " + BODY, "Post:"),
+        (BODY[:-20] + " (214 characters)", "characters)"),
+    ],
+)
+def test_commentary_is_reported(x_post, token):
+    problems = commentary_problems(x_post)
+    assert len(problems) == 1
+    assert f'"{token}"' in problems[0]
+
+
+def test_extra_banned_tokens_from_the_environment(monkeypatch):
+    monkeypatch.setenv("X_POST_BANNED_TOKENS", "Hashtag, Draft")
+    assert commentary_problems(BODY + " Draft") != []
+    assert commentary_problems(BODY.replace("market", "drafty")) == []
+
+
+def test_too_long_post():
+    x_post = BODY + "x" * 100
+    assert check_x_post(x_post) == [
+        f"The post has {len(x_post)} characters, cut at least {len(x_post) - MAX_LENGTH} to get "
+        f"to {MAX_LENGTH} or fewer."
+    ]
+
+
+def test_too_short_post():
+    assert check_x_post("To fly, or not to fly.") == [
+        f"The post has 22 characters, add at least {MIN_LENGTH - 22} to reach {MIN_LENGTH} or more."
+    ]
+
+
+def test_emojis_are_reported_once_each():
+    x_post = BODY[:-10] + " \U0001F697✈️\U0001F697"
+    problems = check_x_post(x_post)
+    assert problems == ["Remove the emojis ✈ \U0001F697, emojis are not allowed."]
@@ -8,6 +8,8 @@ import requests
 import html2text
 import re
 
+from tools.http_session import get_session
+
 class FixedSEC10KToolSchema(BaseModel):
     """Input for SEC10KTool."""
     search_query: str = Field(
@@ -66,7 +68,7 @@ class SEC10KTool(RagTool):
                 "Accept-Encoding": "gzip, deflate",
                 "Host": "www.sec.gov"
             }
-            response = requests.get(url, headers=headers)
+            response = get_session().get(url, headers=headers)
             response.raise_for_status()  
             h = html2text.HTML2Text()
             h.ignore_links = False
@@ -145,7 +147,7 @@ class SEC10QTool(RagTool):
                 "Accept-Encoding": "gzip, deflate",
                 "Host": "www.sec.gov"
             }
-            response = requests.get(url, headers=headers)
+            response = get_session().get(url, headers=headers)
             response.raise_for_status()  # Raise an exception for HTTP errors
             h = html2text.HTML2Text()
             h.ignore_links = False
@@ -0,0 +1,62 @@
+"""Replays tool-style HTTP calls against a local stub server.
+
+Compares one-off `requests.request` calls, which open a new connection every
+time, with the pooled keep-alive session the tools now use.
+
+    python benchmark_http_session.py [n_calls]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from tools.http_session import PooledSession
+
+
+class StubHandler(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+  disable_nagle_algorithm = True
+
+  def do_POST(self):
+    self.rfile.read(int(self.headers.get('content-length', 0)))
+    body = json.dumps({"organic": []}).encode("utf-8")
+    self.send_response(200)
+    self.send_header("content-type", "application/json")
+    self.send_header("content-length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, format, *args):
+    pass
+
+
+def replay(post, url, n_calls):
+  payload = json.dumps({"q": "benchmark"})
+  headers = {'content-type': 'application/json'}
+  start = time.perf_counter()
+  for _ in range(n_calls):
+    post(url, headers=headers, data=payload).json()
+  return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+  n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+  server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  url = f"http://127.0.0.1:{server.server_port}/search"
+
+  def unpooled(url, **kwargs):
+    return requests.request("POST", url, **kwargs)
+
+  session = PooledSession()
+  baseline = replay(unpooled, url, n_calls)
+  pooled = replay(session.post, url, n_calls)
+  server.shutdown()
+
+  print(f"{n_calls} calls")
+  print(f"  requests.request: {baseline * 1000 / n_calls:.2f} ms/call")
+  print(f"  pooled session:   {pooled * 1000 / n_calls:.2f} ms/call")
+  print(f"  speedup:          {baseline / pooled:.1f}x")
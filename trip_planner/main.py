@@ -2,6 +2,8 @@ from crewai import Crew
 from textwrap import dedent
 from trip_agents import TripAgents
 from trip_tasks import TripTasks
+from tools.page_cache import get_page_cache
+from tools.search_cache import get_search_cache
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -79,3 +81,6 @@ if __name__ == "__main__":
   print("## Here is you Trip Plan")
   print("########################\n")
   print(result)
+  print("\n## Cache statistics")
+  print(f"Search results: {get_search_cache().stats()}")
+  print(f"Scraped pages:  {get_page_cache().stats()}")
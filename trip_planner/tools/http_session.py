@@ -0,0 +1,48 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (5, 60)
+
+
+class PooledSession(requests.Session):
+  """Keep-alive session that applies a default timeout to every request."""
+
+  def __init__(self, timeout=DEFAULT_TIMEOUT, pool_connections=10,
+               pool_maxsize=10, retries=3, backoff_factor=0.5):
+    super().__init__()
+    self.timeout = timeout
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        # Search and scrape endpoints are read-only even when they use POST.
+        allowed_methods=frozenset(["GET", "HEAD", "POST"]),
+        respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          max_retries=retry)
+    self.mount("https://", adapter)
+    self.mount("http://", adapter)
+
+  def request(self, method, url, **kwargs):
+    kwargs.setdefault("timeout", self.timeout)
+    return super().request(method, url, **kwargs)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+  """Returns the process-wide pooled session, creating it on first use."""
+  global _session
+  with _session_lock:
+    if _session is None:
+      _session = PooledSession(
+          pool_maxsize=int(os.environ.get('HTTP_POOL_MAXSIZE', 10)),
+          retries=int(os.environ.get('HTTP_RETRIES', 3)))
+    return _session
@@ -0,0 +1,165 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+class PageCache():
+  """Two-level SQLite cache for scraped pages.
+
+  The first level keeps the raw HTML of a page keyed by URL, together with
+  the ETag/Last-Modified validators of the origin. Pages younger than `ttl`
+  are served as-is; older ones are revalidated with a conditional request
+  and only re-scraped if the origin reports a change.
+
+  The second level keeps LLM summaries keyed by a hash of the model and the
+  prompt, chunk included, so an unchanged chunk is never summarized twice by
+  the same model.
+  """
+
+  def __init__(self, path, ttl=6 * 60 * 60, max_bytes=256 * 1024 * 1024):
+    self.path = path
+    self.ttl = ttl
+    self.max_bytes = max_bytes
+    self.counters = {
+        "page_hits": 0,
+        "page_revalidated": 0,
+        "page_misses": 0,
+        "summary_hits": 0,
+        "summary_misses": 0
+    }
+    self._lock = threading.Lock()
+    directory = os.path.dirname(path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    self._conn = sqlite3.connect(path, check_same_thread=False)
+    self._conn.executescript("""
+      CREATE TABLE IF NOT EXISTS pages (
+        url TEXT PRIMARY KEY,
+        html TEXT NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        size INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+      );
+      CREATE TABLE IF NOT EXISTS summaries (
+        key TEXT PRIMARY KEY,
+        summary TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        accessed_at REAL NOT NULL
+      );""")
+    self._conn.commit()
+
+  def get_page(self, url, revalidate):
+    """Returns the cached HTML for `url`, or None if it has to be scraped.
+
+    `revalidate(etag, last_modified)` is called for stale entries and must
+    return True when the origin reports the page as unchanged.
+    """
+    now = time.time()
+    with self._lock:
+      row = self._conn.execute(
+          "SELECT html, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+          (url, )).fetchone()
+    if row is None:
+      self._count("page_misses")
+      return None
+    html, etag, last_modified, fetched_at = row
+    if now - fetched_at > self.ttl:
+      if not (etag or last_modified) or not revalidate(etag, last_modified):
+        self._count("page_misses")
+        return None
+      self._count("page_revalidated")
+      fetched_at = now
+    else:
+      self._count("page_hits")
+    with self._lock:
+      self._conn.execute(
+          "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+          (fetched_at, now, url))
+      self._conn.commit()
+    return html
+
+  def set_page(self, url, html, etag=None, last_modified=None):
+    now = time.time()
+    with self._lock:
+      self._conn.execute(
+          "INSERT OR REPLACE INTO pages (url, html, etag, last_modified, size, "
+          "fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+          (url, html, etag, last_modified, len(html), now, now))
+      self._evict()
+      self._conn.commit()
+
+  @staticmethod
+  def summary_key(prompt, model=""):
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+  def get_summary(self, prompt, model=""):
+    key = self.summary_key(prompt, model)
+    with self._lock:
+      row = self._conn.execute(
+          "SELECT summary FROM summaries WHERE key = ?", (key, )).fetchone()
+      if row is not None:
+        self._conn.execute(
+            "UPDATE summaries SET accessed_at = ? WHERE key = ?",
+            (time.time(), key))
+        self._conn.commit()
+    self._count("summary_hits" if row is not None else "summary_misses")
+    return row[0] if row is not None else None
+
+  def set_summary(self, prompt, summary, model=""):
+    summary = str(summary)
+    with self._lock:
+      self._conn.execute(
+          "INSERT OR REPLACE INTO summaries (key, summary, size, accessed_at) "
+          "VALUES (?, ?, ?, ?)",
+          (self.summary_key(prompt, model), summary, len(summary), time.time()))
+      self._evict()
+      self._conn.commit()
+
+  def _count(self, counter):
+    with self._lock:
+      self.counters[counter] += 1
+
+  def _evict(self):
+    total = self._conn.execute(
+        "SELECT (SELECT COALESCE(SUM(size), 0) FROM pages) + "
+        "(SELECT COALESCE(SUM(size), 0) FROM summaries)").fetchone()[0]
+    if total <= self.max_bytes:
+      return
+    rows = self._conn.execute(
+        "SELECT 'pages', url, size, accessed_at FROM pages UNION ALL "
+        "SELECT 'summaries', key, size, accessed_at FROM summaries "
+        "ORDER BY accessed_at ASC").fetchall()
+    for table, key, size, _ in rows:
+      if total <= self.max_bytes:
+        break
+      column = "url" if table == "pages" else "key"
+      self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (key, ))
+      total -= size
+
+  def stats(self):
+    with self._lock:
+      pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+      summaries = self._conn.execute(
+          "SELECT COUNT(*) FROM summaries").fetchone()[0]
+      return dict(self.counters, pages=pages, summaries=summaries)
+
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+  """Returns the process-wide page cache, creating it on first use."""
+  global _page_cache
+  with _page_cache_lock:
+    if _page_cache is None:
+      _page_cache = PageCache(
+          os.environ.get('PAGE_CACHE_PATH', '.cache/page_cache.sqlite3'),
+          ttl=int(os.environ.get('PAGE_CACHE_TTL', 6 * 60 * 60)),
+          max_bytes=int(
+              os.environ.get('PAGE_CACHE_MAX_BYTES', 256 * 1024 * 1024)))
+    return _page_cache
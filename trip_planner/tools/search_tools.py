@@ -1,9 +1,11 @@
 import json
 import os
 
-import requests
 from langchain.tools import tool
 
+from tools.http_session import get_session
+from tools.search_cache import get_search_cache
+
 
 class SearchTools():
 
@@ -12,26 +14,29 @@ class SearchTools():
     """Useful to search the internet
     about a a given topic and return relevant results"""
     top_result_to_return = 4
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
-    headers = {
-        'X-API-KEY': os.environ['SERPER_API_KEY'],
-        'content-type': 'application/json'
-    }
-    response = requests.request("POST", url, headers=headers, data=payload)
-    # check if there is an organic key
-    if 'organic' not in response.json():
-      return "Sorry, I couldn't find anything about that, there could be an error with you serper api key."
-    else:
-      results = response.json()['organic']
-      string = []
-      for result in results[:top_result_to_return]:
-        try:
-          string.append('\n'.join([
-              f"Title: {result['title']}", f"Link: {result['link']}",
-              f"Snippet: {result['snippet']}", "\n-----------------"
-          ]))
-        except KeyError:
-          next
+    cache = get_search_cache()
+    results = cache.get(query, top_result_to_return)
+    if results is None:
+      url = "https://google.serper.dev/search"
+      payload = json.dumps({"q": query})
+      headers = {
+          'X-API-KEY': os.environ['SERPER_API_KEY'],
+          'content-type': 'application/json'
+      }
+      response = get_session().post(url, headers=headers, data=payload)
+      # check if there is an organic key
+      if 'organic' not in response.json():
+        return "Sorry, I couldn't find anything about that, there could be an error with you serper api key."
+      results = response.json()['organic'][:top_result_to_return]
+      cache.set(query, top_result_to_return, results)
+    string = []
+    for result in results:
+      try:
+        string.append('\n'.join([
+            f"Title: {result['title']}", f"Link: {result['link']}",
+            f"Snippet: {result['snippet']}", "\n-----------------"
+        ]))
+      except KeyError:
+        next
 
-      return '\n'.join(string)
+    return '\n'.join(string)
@@ -0,0 +1,165 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from write_a_book_with_flows.types import Chapter, ChapterOutline
+
+
+def _partial_path(path: Path) -> Path:
+    return path.with_name(path.name + ".partial")
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".index.json")
+
+
+def _resumable_index(path: Path) -> Optional[dict]:
+    """
+    The index of a crashed run that left chapters in the partial file of `path`, if there is one.
+    """
+    try:
+        with open(_index_path(path), "r", encoding="utf-8") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(index, dict)
+        or index.get("complete")
+        or index.get("file") != _partial_path(path).name
+        or not index.get("chapters")
+        or not _partial_path(path).exists()
+    ):
+        return None
+    return index
+
+
+class BookWriter:
+    """
+    Appends chapters to a Markdown file as soon as they can be written in outline order.
+
+    Chapters may finish in any order; each one is held back only until every chapter before it has
+    been written. The book is written to `<name>.partial` and atomically renamed to its final name
+    by `close()`. After every chapter a sidecar `<name>.index.json` records the byte offset and
+    length of each chapter, so a crashed run keeps the chapters it finished and readers can seek
+    straight to a chapter without parsing the whole file.
+
+    The index also records the outline the book is written from, so a rerun can pick it up with
+    `saved_outline()` instead of generating a new one. A rerun with the same outline picks the
+    partial file up where the crashed run stopped: the chapters it indexed are kept (see `written`
+    and `read()`) and only the later ones have to be added. A partial file written from any other
+    outline is moved aside to `<name>.<timestamp>.partial` and the book is started over.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], outline: Optional[List[ChapterOutline]] = None
+    ):
+        self.path = Path(path)
+        self.partial_path = _partial_path(self.path)
+        self.index_path = _index_path(self.path)
+        self.outline = [chapter.model_dump() for chapter in outline or []]
+        index = _resumable_index(self.path)
+        self._index: List[dict] = (
+            index["chapters"] if index and index.get("outline") == self.outline else []
+        )
+        if not self._index:
+            self._set_aside()
+        end = self._index[-1]["offset"] + self._index[-1]["length"] if self._index else 0
+        self._file = open(self.partial_path, "ab")
+        # Drop anything written after the last indexed chapter, such as a torn append
+        self._file.truncate(end)
+        self._file.seek(end)
+        self._pending: Dict[int, Chapter] = {}
+        self._next_position = len(self._index)
+
+    @staticmethod
+    def saved_outline(path: Union[str, Path]) -> Optional[List[ChapterOutline]]:
+        """
+        The outline of a crashed run that can be resumed at `path`, or None if there is none.
+        """
+        index = _resumable_index(Path(path))
+        if index is None:
+            return None
+        try:
+            return [ChapterOutline(**chapter) for chapter in index.get("outline") or []] or None
+        except (TypeError, ValueError):
+            return None
+
+    def _set_aside(self):
+        # Never throw away chapters on disk, a partial file that can't be resumed is kept next to the book
+        if self.partial_path.exists() and self.partial_path.stat().st_size:
+            stale_path = self.path.with_name(f"{self.path.name}.{int(time.time())}.partial")
+            os.replace(self.partial_path, stale_path)
+            print(f"{self.partial_path} does not match the outline, moved it to {stale_path}")
+
+    def add(self, position: int, chapter: Chapter):
+        """
+        Hand over the chapter at `position` (0-based) in the outline.
+        """
+        self._pending[position] = chapter
+        while self._next_position in self._pending:
+            self._append(self._pending.pop(self._next_position))
+            self._next_position += 1
+
+    def _append(self, chapter: Chapter):
+        data = f"# {chapter.title}\n\n{chapter.content}\n\n".encode("utf-8")
+        offset = self._file.tell()
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._index.append(
+            {
+                "position": self._next_position,
+                "title": chapter.title,
+                "offset": offset,
+                "length": len(data),
+            }
+        )
+        self._write_index(self.partial_path, complete=False)
+
+    def _write_index(self, book_path: Path, complete: bool):
+        index = {
+            "file": book_path.name,
+            "complete": complete,
+            "outline": self.outline,
+            "chapters": self._index,
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(index, file, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    @property
+    def written(self) -> int:
+        return len(self._index)
+
+    def read(self, position: int) -> Chapter:
+        """
+        Read back a chapter that is already on disk.
+        """
+        entry = next(entry for entry in self._index if entry["position"] == position)
+        with open(self.partial_path if not self._file.closed else self.path, "rb") as file:
+            file.seek(entry["offset"])
+            data = file.read(entry["length"]).decode("utf-8")
+        heading = f"# {entry['title']}\n\n"
+        return Chapter(title=entry["title"], content=data[len(heading) : -2])
+
+    def close(self) -> Path:
+        """
+        Finish the book and move it to its final path.
+        """
+        if self._pending:
+            missing = [
+                position
+                for position in range(self._next_position, max(self._pending))
+                if position not in self._pending
+            ]
+            print(f"Chapters {missing} never finished, writing the remaining chapters anyway")
+            for position in sorted(self._pending):
+                self._next_position = position
+                self._append(self._pending.pop(position))
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+        self._write_index(self.path, complete=True)
+        return self.path
@@ -5,9 +5,11 @@ from typing import List
 from crewai.flow.flow import Flow, listen, start
 from pydantic import BaseModel
 
+from write_a_book_with_flows.book_writer import BookWriter
 from write_a_book_with_flows.crews.write_book_chapter_crew.write_book_chapter_crew import (
     WriteBookChapterCrew,
 )
+from write_a_book_with_flows.outline import CompactOutline
 from write_a_book_with_flows.types import Chapter, ChapterOutline
 
 from write_a_book_with_flows.crews.outline_book_crew.outline_crew import OutlineCrew
@@ -18,6 +20,10 @@ class BookState(BaseModel):
     title: str = "The Current State of AI in September 2024"
     book: List[Chapter] = []
     book_outline: List[ChapterOutline] = []
+    # How many chapters are written at the same time
+    max_concurrent_chapters: int = 10
+    # Chapters this close to the one being written get their full description in the prompt
+    outline_window: int = 1
     topic: str = (
         "Exploring the latest trends in AI across different industries as of September 2024"
     )
@@ -32,8 +38,19 @@ class BookState(BaseModel):
 class BookFlow(Flow[BookState]):
     initial_state = BookState
 
+    def book_path(self) -> str:
+        # Create the filename by replacing spaces with underscores and adding .md extension
+        return f"./{self.state.title.replace(' ', '_')}.md"
+
     @start()
     def generate_book_outline(self):
+        # A crashed run is resumed from the outline it was writing, a new one would not match it
+        saved_outline = BookWriter.saved_outline(self.book_path())
+        if saved_outline:
+            print(f"Reusing the outline of the unfinished book at {self.book_path()}")
+            self.state.book_outline = saved_outline
+            return saved_outline
+
         print("Kickoff the Book Outline Crew")
         output = (
             OutlineCrew()
@@ -52,66 +69,64 @@ class BookFlow(Flow[BookState]):
         print("Writing Book Chapters")
         tasks = []
 
-        async def write_single_chapter(chapter_outline):
-            output = (
-                WriteBookChapterCrew()
-                .crew()
-                .kickoff(
-                    inputs={
-                        "goal": self.state.goal,
-                        "topic": self.state.topic,
-                        "chapter_title": chapter_outline.title,
-                        "chapter_description": chapter_outline.description,
-                        "book_outline": [
-                            chapter_outline.model_dump_json()
-                            for chapter_outline in self.state.book_outline
-                        ],
-                    }
+        # Chapters are appended to the book as soon as every chapter before them is done
+        self.book_writer = BookWriter(self.book_path(), outline=self.state.book_outline)
+        # Chapters a crashed run of the same outline already wrote are kept
+        resumed = [self.book_writer.read(position) for position in range(self.book_writer.written)]
+        if resumed:
+            print(f"Resuming the book after {len(resumed)} chapters already on disk")
+        semaphore = asyncio.Semaphore(max(1, self.state.max_concurrent_chapters))
+        # Serialize the outline once instead of dumping every chapter to JSON for every chapter
+        outline = CompactOutline(self.state.book_outline)
+
+        async def write_single_chapter(position, chapter_outline):
+            # kickoff_async runs the crew in a worker thread, so chapters are written in parallel
+            async with semaphore:
+                output = await (
+                    WriteBookChapterCrew()
+                    .crew()
+                    .kickoff_async(
+                        inputs={
+                            "goal": self.state.goal,
+                            "topic": self.state.topic,
+                            "chapter_title": chapter_outline.title,
+                            "chapter_description": chapter_outline.description,
+                            "book_outline": outline.context(
+                                position, self.state.outline_window
+                            ),
+                        }
+                    )
                 )
-            )
             title = output["title"]
             content = output["content"]
             chapter = Chapter(title=title, content=content)
+            self.book_writer.add(position, chapter)
             return chapter
 
-        for chapter_outline in self.state.book_outline:
+        for position, chapter_outline in enumerate(self.state.book_outline):
+            if position < len(resumed):
+                continue
             print(f"Writing Chapter: {chapter_outline.title}")
             print(f"Description: {chapter_outline.description}")
             # Schedule each chapter writing task
-            task = asyncio.create_task(write_single_chapter(chapter_outline))
+            task = asyncio.create_task(write_single_chapter(position, chapter_outline))
             tasks.append(task)
 
-        # Await all chapter writing tasks concurrently
+        # Await all chapter writing tasks concurrently, gather keeps the outline order
         chapters = await asyncio.gather(*tasks)
         print("Newly generated chapters:", chapters)
-        self.state.book.extend(chapters)
+        self.state.book.extend(resumed + chapters)
 
         print("Book Chapters", self.state.book)
 
     @listen(write_chapters)
     async def join_and_save_chapter(self):
         print("Joining and Saving Book Chapters")
-        # Combine all chapters into a single markdown string
-        book_content = ""
-
-        for chapter in self.state.book:
-            # Add the chapter title as an H1 heading
-            book_content += f"# {chapter.title}\n\n"
-            # Add the chapter content
-            book_content += f"{chapter.content}\n\n"
-
-        # The title of the book from self.state.title
-        book_title = self.state.title
-
-        # Create the filename by replacing spaces with underscores and adding .md extension
-        filename = f"./{book_title.replace(' ', '_')}.md"
-
-        # Save the combined content into the file
-        with open(filename, "w", encoding="utf-8") as file:
-            file.write(book_content)
+        # Every chapter is already on disk, only the final rename is left
+        path = self.book_writer.close()
 
-        print(f"Book saved as {filename}")
-        return book_content
+        print(f"Book saved as {path} ({self.book_writer.written} chapters)")
+        return path.read_text(encoding="utf-8")
 
 
 def kickoff():
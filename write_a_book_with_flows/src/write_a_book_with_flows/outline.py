@@ -0,0 +1,34 @@
+from typing import List
+
+from write_a_book_with_flows.types import ChapterOutline
+
+
+class CompactOutline:
+    """
+    Book outline serialized once into plain lines, for use as prompt context.
+
+    `context(position)` gives the chapters within `window` of the current one in full and only the
+    titles of the others, so each prompt carries the nearby detail it needs without repeating every
+    chapter description for every chapter of the book.
+    """
+
+    def __init__(self, outline: List[ChapterOutline]):
+        self.titles = [
+            f"{number}. {chapter.title}" for number, chapter in enumerate(outline, start=1)
+        ]
+        self.full = [
+            f"{title}: {chapter.description}"
+            for title, chapter in zip(self.titles, outline)
+        ]
+
+    def context(self, position: int, window: int = 1) -> str:
+        lines = []
+        for index in range(len(self.titles)):
+            if index == position:
+                # The current chapter's description is already part of the prompt
+                lines.append(f"{self.titles[index]} (this chapter)")
+            elif abs(index - position) <= window:
+                lines.append(self.full[index])
+            else:
+                lines.append(self.titles[index])
+        return "\n".join(lines)